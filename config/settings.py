@@ -1,17 +1,96 @@
 """
 Configuration settings for Sauce Demo automation tests
 """
+import os
 
 # Application URLs
 BASE_URL = "https://www.saucedemo.com/"
 LOGIN_PAGE_URL = "https://www.saucedemo.com/"
 INVENTORY_PAGE_URL = "https://www.saucedemo.com/inventory.html"
+INVENTORY_ITEM_PAGE_URL = "https://www.saucedemo.com/inventory-item.html?id={item_id}"
 
 # Browser Configuration
 BROWSER_NAME = "chrome"
 HEADLESS_MODE = False
 IMPLICIT_WAIT = 10
 EXPLICIT_WAIT = 15
+POLL_FREQUENCY = 0.5
+
+# Memory Watchdog
+# Thresholds that trigger recycling of a reused driver between tests.
+MEMORY_PSS_LIMIT_MB = int(os.getenv("MEMORY_PSS_LIMIT_MB", "1500"))
+MEMORY_JS_HEAP_LIMIT_MB = int(os.getenv("MEMORY_JS_HEAP_LIMIT_MB", "256"))
+MAX_TESTS_PER_DRIVER = int(os.getenv("MAX_TESTS_PER_DRIVER", "50"))
+
+# Remote Execution
+# Comma separated Remote WebDriver endpoints (Selenium Grid, standalone
+# server or plain chromedriver processes). Empty means local Chrome.
+REMOTE_ENDPOINTS = [url.strip() for url in os.getenv("SELENIUM_REMOTE_ENDPOINTS", "").split(",") if url.strip()]
+REMOTE_MAX_SESSIONS_PER_NODE = int(os.getenv("SELENIUM_REMOTE_MAX_SESSIONS", "4"))
+REMOTE_CONNECTION_POOL_SIZE = 8
+REMOTE_ACQUIRE_TIMEOUT = int(os.getenv("SELENIUM_REMOTE_ACQUIRE_TIMEOUT", "300"))  # Seconds to wait for a free node slot
+
+# Execution Profiles
+# Selected with --profile or the EXECUTION_PROFILE environment variable.
+# Each profile overrides the browser defaults above; --headless/--headed and
+# --browser on the command line take precedence over the profile values.
+DEFAULT_PROFILE = os.getenv("EXECUTION_PROFILE", "default")
+EXECUTION_PROFILES = {
+    "default": {
+        "headless": HEADLESS_MODE,
+        "reuse_driver": False,
+        "page_load_strategy": "normal",
+        "implicit_wait": IMPLICIT_WAIT,
+        "explicit_wait": EXPLICIT_WAIT,
+        "poll_frequency": POLL_FREQUENCY,
+        "window_size": None,
+        "chrome_arguments": []
+    },
+    "fast-ci": {
+        "headless": True,
+        "reuse_driver": False,
+        "page_load_strategy": "eager",
+        "implicit_wait": 0,
+        "explicit_wait": 10,
+        "poll_frequency": 0.1,
+        "window_size": (1366, 768),
+        "chrome_arguments": [
+            "--disable-gpu",
+            "--disable-extensions",
+            "--disable-background-networking",
+            "--no-first-run",
+            "--mute-audio"
+        ]
+    },
+    "debug": {
+        "headless": False,
+        "reuse_driver": False,
+        "page_load_strategy": "normal",
+        "implicit_wait": IMPLICIT_WAIT,
+        "explicit_wait": 30,
+        "poll_frequency": 0.5,
+        "window_size": (1920, 1080),
+        "chrome_arguments": [
+            "--auto-open-devtools-for-tabs"
+        ]
+    },
+    "load": {
+        "headless": True,
+        "reuse_driver": True,
+        "page_load_strategy": "none",
+        "implicit_wait": 0,
+        "explicit_wait": 20,
+        "poll_frequency": 0.2,
+        "window_size": (1280, 720),
+        "chrome_arguments": [
+            "--disable-gpu",
+            "--disable-extensions",
+            "--disable-background-networking",
+            "--disable-renderer-backgrounding",
+            "--blink-settings=imagesEnabled=false"
+        ]
+    }
+}
 
 # User Credentials
 TEST_USERS = {
@@ -43,11 +122,42 @@ TEST_USERS = {
 
 # Test Data
 BANNED_USER_ERROR_MESSAGE = "Sorry, this user has been locked out."
+EXPECTED_PRICE_RANGE = (0.01, 100.00)   # Lowest and highest valid product price
+
+# Inventory Crawler
+CRAWLER_MAX_WORKERS = int(os.getenv("CRAWLER_MAX_WORKERS", "4"))
+CRAWLER_ITEMS_PER_TASK = 3          # Item detail pages visited per task
 
 # Report Settings
 REPORT_FOLDER = "reports"
 SCREENSHOTS_FOLDER = "screenshots"
 EXTRACTED_DATA_FOLDER = "extracted_data"
+VISUAL_BASELINE_FOLDER = "visual_baselines"
+WEBDRIVER_RECORDINGS_FOLDER = "recordings"
+VISUAL_DIFF_FOLDER = "reports/visual_diffs"
+TRACE_FOLDER = "reports/traces"
+HAR_FOLDER = "reports/har"
+
+# Visual Comparison
+VISUAL_DIFF_THRESHOLD = 0.001      # Max fraction of differing pixels
+VISUAL_PIXEL_TOLERANCE = 16        # Per-channel difference ignored as noise
+VISUAL_REGION_GRID = (8, 8)        # Rows, columns of the per-region scores
+VISUAL_HASH_FAIL_DISTANCE = 16     # Perceptual hash bits (of 64) that fail without a pixel diff
+
+# Browser Tracing
+TRACE_CATEGORIES = os.getenv(
+    "CHROME_TRACE_CATEGORIES",
+    "devtools.timeline,v8.execute,blink.user_timing,loading,toplevel"
+)
+
+# Network Capture
+# Budgets per page: request count, encoded bytes transferred, slowest request
+NETWORK_BUDGETS = {
+    "login": {"max_requests": 30, "max_bytes": 2_000_000, "max_request_ms": 5000},
+    "inventory": {"max_requests": 40, "max_bytes": 5_000_000, "max_request_ms": 5000},
+}
+NETWORK_IDLE_TIMEOUT = 10          # Max seconds to wait for the network to go idle
+NETWORK_QUIET_PERIOD = 0.5         # Seconds without requests that count as idle
 
 # Logging
 LOG_LEVEL = "INFO"
@@ -4,16 +4,30 @@ Pytest configuration and fixtures
 import pytest
 import os
 import sys
-from datetime import datetime
-from utils.driver_factory import DriverFactory
-from utils.logger_config import setup_logger
-from utils.screenshot_helper import ScreenshotHelper
-from config.settings import SCREENSHOTS_FOLDER
+import time
+import uuid
+import logging
+from utils.execution_profile import ExecutionProfile
+from utils.trace_recorder import TraceRecorder, trace_path
+from config.settings import (
+    DEFAULT_PROFILE, EXECUTION_PROFILES, WEBDRIVER_RECORDINGS_FOLDER,
+    MEMORY_PSS_LIMIT_MB, MEMORY_JS_HEAP_LIMIT_MB, MAX_TESTS_PER_DRIVER, TRACE_FOLDER,
+    HAR_FOLDER, VISUAL_BASELINE_FOLDER
+)
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-logger = setup_logger(__name__)
+# Browser imports (selenium, DriverFactory, ScreenshotHelper) and the log file
+# handler are set up lazily by the fixtures, so collection stays cheap for
+# --collect-only, -k filtering and xdist worker startup.
+logger = logging.getLogger(__name__)
+
+# Collection time per worker, filled on the xdist controller
+_collection_times = {}
+
+# Remote WebDriver latency per node, merged from this process and xdist workers
+_remote_latency = {}
 
 
 def pytest_addoption(parser):
@@ -21,15 +35,71 @@ def pytest_addoption(parser):
     parser.addoption(
         "--headless",
         action="store_true",
-        default=False,
-        help="Run tests in headless mode"
+        default=None,
+        help="Run tests in headless mode (overrides the profile setting)"
+    )
+    parser.addoption(
+        "--headed",
+        action="store_false",
+        dest="headless",
+        default=None,
+        help="Run tests with a visible browser window (overrides the profile setting)"
     )
     parser.addoption(
         "--browser",
         action="store",
-        default="chrome",
+        default=None,
         help="Browser to run tests on (default: chrome)"
     )
+    parser.addoption(
+        "--profile",
+        action="store",
+        default=DEFAULT_PROFILE,
+        choices=sorted(EXECUTION_PROFILES),
+        help="Execution profile to use (default: $EXECUTION_PROFILE or 'default')"
+    )
+    parser.addoption(
+        "--remote-endpoints",
+        action="store",
+        default=None,
+        help="Comma separated Remote WebDriver endpoints (default: $SELENIUM_REMOTE_ENDPOINTS, local browser if empty)"
+    )
+    parser.addoption(
+        "--reuse-driver",
+        action="store_true",
+        default=None,
+        help="Reuse one driver across tests, recycled when memory thresholds are exceeded (overrides the profile setting)"
+    )
+    parser.addoption(
+        "--record-webdriver",
+        action="store_true",
+        default=False,
+        help=f"Record the WebDriver traffic of each test to {WEBDRIVER_RECORDINGS_FOLDER}/"
+    )
+    parser.addoption(
+        "--replay-webdriver",
+        action="store_true",
+        default=False,
+        help=f"Replay recorded WebDriver traffic from {WEBDRIVER_RECORDINGS_FOLDER}/ instead of starting a browser"
+    )
+    parser.addoption(
+        "--chrome-trace",
+        action="store_true",
+        default=None,
+        help=f"Write a Chrome trace of each test, merging browser tracing with Python spans, to {TRACE_FOLDER}/"
+    )
+    parser.addoption(
+        "--network-capture",
+        action="store_true",
+        default=None,
+        help=f"Capture the network traffic of every test and write it as HAR to {HAR_FOLDER}/"
+    )
+    parser.addoption(
+        "--update-baselines",
+        action="store_true",
+        default=False,
+        help=f"Store screenshots as visual baselines in {VISUAL_BASELINE_FOLDER}/ where they are missing or differ"
+    )
 
 
 def pytest_configure(config):
@@ -38,6 +108,341 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "scenario2: Mark test as scenario 2 (failed login)")
     config.addinivalue_line("markers", "scenario3: Mark test as scenario 3 (extract data)")
     config.addinivalue_line("markers", "login: Tests related to login functionality")
+    config.addinivalue_line("markers", "command_budget(n): Fail the test if it sends more than n WebDriver commands")
+    config.addinivalue_line("markers", "visual: Visual regression tests")
+    config.addinivalue_line("markers", "crawler: Multi-user inventory crawl")
+    config.addinivalue_line("markers", "network: Network budget tests")
+    config.addinivalue_line("markers", "unit: Browserless unit tests")
+    
+    # Resolve the execution profile from the command line
+    remote_endpoints = config.getoption("--remote-endpoints")
+    if remote_endpoints is not None:
+        remote_endpoints = [url.strip() for url in remote_endpoints.split(",") if url.strip()]
+    
+    profile = ExecutionProfile.load(
+        config.getoption("--profile"),
+        headless=config.getoption("--headless"),
+        browser_name=config.getoption("--browser"),
+        remote_endpoints=remote_endpoints,
+        reuse_driver=config.getoption("--reuse-driver"),
+        chrome_trace=config.getoption("--chrome-trace"),
+        network_capture=config.getoption("--network-capture")
+    )
+    ExecutionProfile.set_active(profile)
+    
+    # Choose the xdist run id on the controller, so it knows the slot table
+    # file its workers share and can remove it in pytest_unconfigure
+    if profile.remote_endpoints and not hasattr(config, "workerinput") \
+            and getattr(config.option, "testrunuid", "") is None:
+        config.option.testrunuid = uuid.uuid4().hex
+
+
+def pytest_unconfigure(config):
+    """Quit the shared driver, close pooled connections and remove the shared slot table"""
+    driver_factory = _loaded_driver_factory()
+    if driver_factory is not None:
+        driver_factory.recycle_shared_driver("end of session")
+        driver_factory.close_remote_pool()
+    
+    run_id = getattr(config.option, "testrunuid", None)
+    if run_id and not hasattr(config, "workerinput") and ExecutionProfile.get_active().remote_endpoints:
+        from utils.remote_driver import remove_shared_slots
+        remove_shared_slots(run_id)
+
+
+def _loaded_driver_factory():
+    """
+    Get DriverFactory only if a fixture already imported it
+    
+    Returns:
+        DriverFactory: DriverFactory class, or None if no driver was created
+    """
+    module = sys.modules.get("utils.driver_factory")
+    return module.DriverFactory if module is not None else None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection(session):
+    """Mark the start of collection in this process"""
+    session.config._collection_start = time.perf_counter()
+    yield
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_finish(session):
+    """Measure collection time of this process"""
+    elapsed = time.perf_counter() - session.config._collection_start
+    
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    _collection_times[worker_id] = elapsed
+    
+    # xdist workers send their timing to the controller
+    if hasattr(session.config, "workeroutput"):
+        session.config.workeroutput["collection_time"] = elapsed
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect the collection time and remote latency reported by an xdist worker"""
+    workeroutput = getattr(node, "workeroutput", {})
+    if "collection_time" in workeroutput:
+        _collection_times[node.workerinput["workerid"]] = workeroutput["collection_time"]
+    if "remote_latency" in workeroutput:
+        _merge_remote_latency(workeroutput["remote_latency"])
+
+
+def pytest_sessionfinish(session):
+    """Hand the remote latency of this process to the report"""
+    driver_factory = _loaded_driver_factory()
+    pool = driver_factory.get_remote_pool() if driver_factory is not None else None
+    if pool is None:
+        return
+    
+    # xdist workers send their stats to the controller
+    if hasattr(session.config, "workeroutput"):
+        session.config.workeroutput["remote_latency"] = pool.latency_stats()
+    else:
+        _merge_remote_latency(pool.latency_stats())
+
+
+def _merge_remote_latency(stats):
+    """
+    Add latency stats of one process to the run totals
+    
+    Args:
+        stats: Stats returned by RemoteNodePool.latency_stats()
+    """
+    for url, node_stats in stats.items():
+        merged = _remote_latency.setdefault(url, {"sessions": 0, "commands": {}})
+        merged["sessions"] += node_stats["sessions"]
+        for command, command_stats in node_stats["commands"].items():
+            total = merged["commands"].setdefault(command, {"count": 0, "total": 0.0, "max": 0.0})
+            total["count"] += command_stats["count"]
+            total["total"] += command_stats["total"]
+            total["max"] = max(total["max"], command_stats["max"])
+
+
+def pytest_report_collectionfinish(config, start_path, items):
+    """Show collection time after collection"""
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    if worker_id in _collection_times:
+        return f"collection time: {_collection_times[worker_id]:.3f}s ({len(items)} items)"
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Report collection times, WebDriver command totals and remote latency"""
+    if _collection_times:
+        terminalreporter.section("collection time")
+        for worker_id, elapsed in sorted(_collection_times.items()):
+            terminalreporter.write_line(f"  {worker_id:<10} {elapsed:.3f}s")
+    
+    _report_command_totals(terminalreporter)
+    _report_browser_memory(terminalreporter)
+    _report_network(terminalreporter)
+    _report_remote_latency(terminalreporter)
+
+
+def _report_remote_latency(terminalreporter):
+    """
+    Print per-command latency of every remote node, including xdist workers
+    
+    Args:
+        terminalreporter: Pytest terminal reporter
+    """
+    if not _remote_latency:
+        return
+    
+    terminalreporter.section("remote WebDriver latency")
+    for url, node_stats in sorted(_remote_latency.items()):
+        terminalreporter.write_line(f"{url} - {node_stats['sessions']} sessions")
+        for command, stats in sorted(node_stats["commands"].items(), key=lambda entry: -entry[1]["total"]):
+            mean = stats["total"] / stats["count"] if stats["count"] else 0.0
+            terminalreporter.write_line(
+                f"  {command:<28} {stats['count']:>6} calls  "
+                f"mean {mean * 1000:8.2f} ms  max {stats['max'] * 1000:8.2f} ms"
+            )
+
+
+def _report_browser_memory(terminalreporter):
+    """
+    Print peak browser memory and driver recycles from the teardown reports
+    
+    Args:
+        terminalreporter: Pytest terminal reporter
+    """
+    samples = []
+    recycles = []
+    for reports in terminalreporter.stats.values():
+        for rep in reports:
+            if getattr(rep, "when", None) != "teardown":
+                continue
+            for name, value in rep.user_properties:
+                if name == "browser_memory":
+                    samples.append((value, rep.nodeid))
+                elif name == "driver_recycled":
+                    recycles.append((rep.nodeid, value))
+    
+    if not samples:
+        return
+    
+    terminalreporter.section("browser memory")
+    for key, label in (("pss_mb", "Browser PSS"), ("js_heap_used_mb", "JS heap used")):
+        measured = [(value[key], nodeid) for value, nodeid in samples if value[key] is not None]
+        if measured:
+            peak, nodeid = max(measured)
+            terminalreporter.write_line(f"Peak {label}: {peak} MB ({nodeid})")
+    for nodeid, reason in recycles:
+        terminalreporter.write_line(f"Driver recycled after {nodeid}: {reason}")
+
+
+def _report_network(terminalreporter):
+    """
+    Print network aggregates per user and page from the teardown reports
+    
+    Args:
+        terminalreporter: Pytest terminal reporter
+    """
+    totals = {}
+    for reports in terminalreporter.stats.values():
+        for rep in reports:
+            if getattr(rep, "when", None) != "teardown":
+                continue
+            for name, pages in rep.user_properties:
+                if name != "network":
+                    continue
+                for page in pages:
+                    key = (page["user"] or "-", page["page"])
+                    total = totals.setdefault(key, {"tests": 0, "requests": 0, "bytes": 0,
+                                                    "slowest_ms": 0, "slowest_url": None})
+                    total["tests"] += 1
+                    total["requests"] += page["requests"]
+                    total["bytes"] += page["bytes"]
+                    if page["slowest_ms"] is not None and page["slowest_ms"] > total["slowest_ms"]:
+                        total["slowest_ms"] = page["slowest_ms"]
+                        total["slowest_url"] = page["slowest_url"]
+    
+    if not totals:
+        return
+    
+    terminalreporter.section("network")
+    terminalreporter.write_line(f"  {'user':<26} {'page':<12} {'requests':>9} {'KB':>9} {'slowest ms':>11}  slowest request")
+    for (user, page), total in sorted(totals.items()):
+        tests = total["tests"]
+        terminalreporter.write_line(
+            f"  {user:<26} {page:<12} {total['requests'] / tests:>9.1f} {total['bytes'] / tests / 1024:>9.1f} "
+            f"{total['slowest_ms']:>11.1f}  {total['slowest_url'] or ''}"
+        )
+    terminalreporter.write_line("  (requests and KB are averages per test)")
+
+
+def _report_command_totals(terminalreporter):
+    """
+    Print WebDriver command totals collected from the call reports
+    
+    Reads the report user properties, so totals also include xdist workers.
+    
+    Args:
+        terminalreporter: Pytest terminal reporter
+    """
+    per_test = []
+    by_type = {}
+    by_method = {}
+    for reports in terminalreporter.stats.values():
+        for rep in reports:
+            if getattr(rep, "when", None) != "call":
+                continue
+            for name, counts in rep.user_properties:
+                if name != "webdriver_commands":
+                    continue
+                per_test.append((counts["total"], rep.nodeid))
+                for command_type, count in counts["by_type"].items():
+                    by_type[command_type] = by_type.get(command_type, 0) + count
+                for method, method_counts in counts["by_method"].items():
+                    by_method[method] = by_method.get(method, 0) + sum(method_counts.values())
+    
+    if not per_test:
+        return
+    
+    terminalreporter.section("WebDriver commands")
+    terminalreporter.write_line(f"Total: {sum(total for total, _ in per_test)} commands in {len(per_test)} tests")
+    terminalreporter.write_line("By type: " + ", ".join(
+        f"{command_type}={count}" for command_type, count in sorted(by_type.items(), key=lambda entry: -entry[1])
+    ))
+    terminalreporter.write_line("By page-object method:")
+    for method, count in sorted(by_method.items(), key=lambda entry: -entry[1]):
+        terminalreporter.write_line(f"  {method:<40} {count:>6}")
+    terminalreporter.write_line("By test:")
+    for total, nodeid in sorted(per_test, reverse=True):
+        terminalreporter.write_line(f"  {nodeid:<60} {total:>6}")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    """Start the trace of a test when tracing is on"""
+    if ExecutionProfile.get_active().chrome_trace:
+        item.trace_recorder = TraceRecorder(item.nodeid)
+        item.trace_recorder.activate()
+    yield from _trace_phase(item, "setup")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Trace the test function"""
+    yield from _trace_phase(item, "call")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    """Trace teardown and write the trace of the test"""
+    yield from _trace_phase(item, "teardown")
+    
+    recorder = getattr(item, "trace_recorder", None)
+    if recorder is not None:
+        recorder.deactivate()
+        path = recorder.save(trace_path(TRACE_FOLDER, item.nodeid))
+        item.user_properties.append(("chrome_trace", path))
+
+
+def _trace_phase(item, when):
+    """
+    Hookwrapper body recording a test phase as a span
+    
+    Args:
+        item: Test item
+        when: Phase name (setup, call or teardown)
+    """
+    recorder = getattr(item, "trace_recorder", None)
+    if recorder is None:
+        yield
+        return
+    with recorder.span(when, "pytest", {"nodeid": item.nodeid}):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    """Trace fixture setup and mark where its teardown starts"""
+    recorder = TraceRecorder.get_active()
+    if recorder is None:
+        yield
+        return
+    
+    with recorder.span(f"{fixturedef.argname} (setup)", "fixture", {"scope": fixturedef.scope}):
+        yield
+    # Finalizers run last-in first-out, so this one runs before the fixture's
+    # own teardown and pytest_fixture_post_finalizer right after it
+    fixturedef.addfinalizer(lambda: setattr(fixturedef, "_trace_teardown_start", TraceRecorder.now()))
+
+
+def pytest_fixture_post_finalizer(fixturedef, request):
+    """Trace fixture teardown"""
+    start = getattr(fixturedef, "_trace_teardown_start", None)
+    recorder = TraceRecorder.get_active()
+    if start is None or recorder is None:
+        return
+    fixturedef._trace_teardown_start = None
+    recorder.add_event(f"{fixturedef.argname} (teardown)", "fixture", start, TraceRecorder.now() - start,
+                       {"scope": fixturedef.scope})
 
 
 @pytest.fixture(scope="function")
@@ -51,19 +456,109 @@ def driver(request):
     Yields:
         WebDriver: WebDriver instance
     """
+    from utils.driver_factory import DriverFactory
+    from utils.command_counter import CommandCounter
+    from utils.webdriver_recording import WebDriverRecorder, recording_path
+    from utils.memory_watchdog import MemoryWatchdog
+    from utils.performance_log import PerformanceLog
+    from utils.network_capture import NetworkCapture, har_path
+    
     logger.info("=" * 80)
     logger.info(f"Starting test: {request.node.name}")
     logger.info("=" * 80)
     
+    path = recording_path(WEBDRIVER_RECORDINGS_FOLDER, request.node.nodeid)
+    replay = request.config.getoption("--replay-webdriver")
+    record = request.config.getoption("--record-webdriver")
+    profile = ExecutionProfile.get_active()
+    reuse = profile.reuse_driver and not (replay or record)
+    capture_network = profile.network_capture or "network_capture" in request.fixturenames
+    if capture_network and not profile.network_capture:
+        # The shared driver was created without the Network log
+        profile = profile.replace(network_capture=True)
+        reuse = False
+    recorder = None
+    
     # Create driver
-    driver = DriverFactory.create_driver()
+    if replay:
+        if not os.path.exists(path):
+            pytest.skip(f"No WebDriver recording: {path}")
+        driver = DriverFactory.create_replay_driver(path)
+    elif reuse:
+        driver = DriverFactory.get_shared_driver()
+    else:
+        driver = DriverFactory.create_driver(profile=profile)
+        if record:
+            recorder = WebDriverRecorder()
+            recorder.attach(driver)
+    
+    # Drop performance log messages of earlier tests on a reused driver
+    trace_recorder = getattr(request.node, "trace_recorder", None)
+    if reuse and (trace_recorder is not None or capture_network):
+        PerformanceLog.clear(driver)
+    # Align the browser trace clock, before the command counter so the mark is not counted
+    if trace_recorder is not None and not replay:
+        trace_recorder.sync_clock(driver)
+    network_capture = None
+    if capture_network:
+        network_capture = NetworkCapture(driver)
+        request.node.network_capture = network_capture
+    
+    # Count WebDriver round-trips sent by the test
+    command_counter = CommandCounter()
+    command_counter.attach(driver)
+    request.node.command_counter = command_counter
+    
+    # Trace WebDriver commands
+    if trace_recorder is not None:
+        trace_recorder.attach(driver)
     
     yield driver
     
     # Cleanup
     logger.info(f"Ending test: {request.node.name}")
-    DriverFactory.quit_driver(driver)
-    logger.info("=" * 80)
+    watchdog = MemoryWatchdog(MEMORY_PSS_LIMIT_MB, MEMORY_JS_HEAP_LIMIT_MB)
+    sample = None
+    # Diagnostics must not keep the driver from being quit or recycled
+    try:
+        # Save the recording before teardown sends its own commands
+        if recorder is not None:
+            recorder.detach()
+            recorder.save(path)
+        if trace_recorder is not None:
+            trace_recorder.detach()
+            if not replay:
+                trace_recorder.collect_browser_events(driver)
+        command_counter.detach()
+        logger.info(f"WebDriver commands: {command_counter.total} {dict(command_counter.by_type)}")
+        
+        # Record network aggregates in the test report and export the HAR
+        if network_capture is not None:
+            request.node.user_properties.append(("network", network_capture.summary()))
+            network_capture.save_har(har_path(HAR_FOLDER, request.node.nodeid))
+        
+        # Record browser memory in the test report
+        if not replay:
+            sample = watchdog.sample(driver)
+            request.node.user_properties.append(("browser_memory", sample.to_dict()))
+            logger.info(f"Browser memory: {sample}")
+    finally:
+        if reuse:
+            # Without a sample the diagnostics failed, so the driver's state is unknown
+            reason = watchdog.recycle_reason(sample) if sample is not None else "teardown diagnostics failed"
+            if reason is None and DriverFactory.shared_driver_test_count() >= MAX_TESTS_PER_DRIVER:
+                reason = f"served {MAX_TESTS_PER_DRIVER} tests"
+            if reason is None:
+                try:
+                    DriverFactory.reset_shared_driver()
+                except Exception as e:
+                    reason = f"reset failed: {str(e)}"
+            if reason is not None:
+                DriverFactory.recycle_shared_driver(reason)
+                request.node.user_properties.append(("driver_recycled", reason))
+        else:
+            DriverFactory.quit_driver(driver)
+        logger.info("=" * 80)
 
 
 @pytest.fixture(scope="function")
@@ -75,6 +570,8 @@ def screenshot_on_failure(driver, request):
         driver: WebDriver instance
         request: Pytest request object
     """
+    from utils.screenshot_helper import ScreenshotHelper
+    
     yield
     
     # If test failed, take screenshot
@@ -83,14 +580,74 @@ def screenshot_on_failure(driver, request):
         logger.info(f"Screenshot saved: {screenshot_path}")
 
 
+@pytest.fixture(scope="function")
+def network_capture(driver, request):
+    """
+    Fixture providing the network capture of the test's driver
+    
+    Requesting it enables the Network log on the driver. Mark pages with
+    start_page() and compare them with NETWORK_BUDGETS using check_budget().
+    The test is skipped when the driver cannot read the performance log,
+    e.g. when replaying, instead of passing every budget with no requests.
+    
+    Args:
+        driver: WebDriver instance
+        request: Pytest request object
+        
+    Returns:
+        NetworkCapture: Capture of the driver's requests
+    """
+    from utils.performance_log import PerformanceLog
+    
+    if not PerformanceLog.available(driver):
+        pytest.skip("Network capture needs the Chrome performance log, which this driver cannot read")
+    return request.node.network_capture
+
+
+@pytest.fixture(scope="session")
+def visual_comparator():
+    """
+    Fixture providing the visual comparator shared by the session
+    
+    Returns:
+        VisualComparator: Comparator using the baselines in VISUAL_BASELINE_FOLDER
+    """
+    from utils.visual_diff import VisualComparator
+    
+    return VisualComparator()
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """Hook to capture test results"""
     outcome = yield
     rep = outcome.get_result()
+    
+    command_counter = getattr(item, "command_counter", None)
+    if rep.when == "call" and command_counter is not None:
+        rep.user_properties.append(("webdriver_commands", command_counter.to_dict()))
+        
+        # Fail tests that exceed their command budget
+        budget = item.get_closest_marker("command_budget")
+        if budget is not None and rep.passed and command_counter.total > budget.args[0]:
+            rep.outcome = "failed"
+            rep.longrepr = (
+                f"WebDriver command budget exceeded: {command_counter.total} > {budget.args[0]}\n"
+                f"By type: {dict(command_counter.by_type)}\n"
+                f"By page-object method: {command_counter.to_dict()['by_method']}"
+            )
+    
     setattr(item, f"rep_{rep.when}", rep)
 
 
+@pytest.fixture(scope="session", autouse=True)
+def configure_logging():
+    """Auto-use fixture to attach console and file handlers once tests run"""
+    from utils.logger_config import setup_logger
+    
+    setup_logger(__name__)
+
+
 @pytest.fixture(autouse=True)
 def log_test_info(request):
     """Auto-use fixture to log test information"""
@@ -1,13 +1,16 @@
 """
 Base Page Object class for all page objects
 """
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from config.settings import EXPLICIT_WAIT
+from utils.execution_profile import ExecutionProfile
+from utils.trace_recorder import traced
 import logging
+import weakref
 
 logger = logging.getLogger(__name__)
 
+# DOM snapshots per driver, shared by all page objects of that driver
+_snapshots = weakref.WeakKeyDictionary()
+
 
 class BasePage:
     """Base class for all page objects"""
@@ -19,10 +22,19 @@ class BasePage:
         Args:
             driver: WebDriver instance
         """
+        # Imported here so collecting tests does not load selenium
+        from selenium.webdriver.support.ui import WebDriverWait
+        
         self.driver = driver
-        self.wait = WebDriverWait(driver, EXPLICIT_WAIT)
+        self.profile = ExecutionProfile.get_active()
+        self.wait = WebDriverWait(
+            driver,
+            self.profile.explicit_wait,
+            poll_frequency=self.profile.poll_frequency
+        )
         self.logger = logger
     
+    @traced
     def navigate_to(self, url):
         """
         Navigate to a URL
@@ -30,9 +42,11 @@ class BasePage:
         Args:
             url: URL to navigate to
         """
+        self.invalidate_snapshot()
         self.driver.get(url)
         self.logger.info(f"Navigated to: {url}")
     
+    @traced
     def find_element(self, locator):
         """
         Find element using the locator
@@ -43,6 +57,8 @@ class BasePage:
         Returns:
             WebElement: The found element
         """
+        from selenium.webdriver.support import expected_conditions as EC
+        
         try:
             element = self.wait.until(EC.presence_of_element_located(locator))
             self.logger.debug(f"Found element: {locator}")
@@ -51,6 +67,7 @@ class BasePage:
             self.logger.error(f"Failed to find element: {locator}. Error: {str(e)}")
             raise
     
+    @traced
     def find_elements(self, locator):
         """
         Find multiple elements using the locator
@@ -69,6 +86,7 @@ class BasePage:
             self.logger.error(f"Failed to find elements: {locator}. Error: {str(e)}")
             raise
     
+    @traced
     def click_element(self, locator):
         """
         Click on an element
@@ -78,12 +96,14 @@ class BasePage:
         """
         try:
             element = self.find_element(locator)
+            self.invalidate_snapshot()
             element.click()
             self.logger.info(f"Clicked on element: {locator}")
         except Exception as e:
             self.logger.error(f"Failed to click element: {locator}. Error: {str(e)}")
             raise
     
+    @traced
     def send_keys(self, locator, keys):
         """
         Send keys to an element
@@ -94,6 +114,7 @@ class BasePage:
         """
         try:
             element = self.find_element(locator)
+            self.invalidate_snapshot()
             element.clear()
             element.send_keys(keys)
             self.logger.info(f"Sent keys to element: {locator}")
@@ -101,6 +122,7 @@ class BasePage:
             self.logger.error(f"Failed to send keys to element: {locator}. Error: {str(e)}")
             raise
     
+    @traced
     def get_text(self, locator):
         """
         Get text from an element
@@ -120,6 +142,7 @@ class BasePage:
             self.logger.error(f"Failed to get text from element: {locator}. Error: {str(e)}")
             raise
     
+    @traced
     def is_element_visible(self, locator):
         """
         Check if an element is visible
@@ -130,6 +153,8 @@ class BasePage:
         Returns:
             bool: True if element is visible, False otherwise
         """
+        from selenium.webdriver.support import expected_conditions as EC
+        
         try:
             element = self.wait.until(EC.visibility_of_element_located(locator))
             self.logger.debug(f"Element is visible: {locator}")
@@ -138,6 +163,7 @@ class BasePage:
             self.logger.debug(f"Element is not visible: {locator}")
             return False
     
+    @traced
     def is_element_present(self, locator):
         """
         Check if an element is present in DOM
@@ -156,6 +182,7 @@ class BasePage:
             self.logger.debug(f"Element is not present: {locator}")
             return False
     
+    @traced
     def get_current_url(self):
         """
         Get current URL
@@ -166,3 +193,44 @@ class BasePage:
         url = self.driver.current_url
         self.logger.debug(f"Current URL: {url}")
         return url
+    
+    @property
+    def snapshot(self):
+        """
+        DOM snapshot of the current page, captured on first use
+        
+        Read-only checks on the snapshot are answered locally instead of
+        with one WebDriver call each. The snapshot is dropped when a page
+        object navigates, clicks or types; call invalidate_snapshot() after
+        changing the page any other way.
+        
+        Returns:
+            DomSnapshot: Cached snapshot
+        """
+        snapshot = _snapshots.get(self.driver)
+        if snapshot is None:
+            snapshot = self.capture_snapshot()
+        return snapshot
+    
+    @traced
+    def capture_snapshot(self):
+        """
+        Capture a fresh DOM snapshot in one WebDriver call
+        
+        Returns:
+            DomSnapshot: New snapshot
+        """
+        from utils.dom_snapshot import DomSnapshot
+        
+        try:
+            snapshot = DomSnapshot.capture(self.driver)
+            _snapshots[self.driver] = snapshot
+            self.logger.debug(f"Captured DOM snapshot of: {snapshot.url}")
+            return snapshot
+        except Exception as e:
+            self.logger.error(f"Failed to capture DOM snapshot. Error: {str(e)}")
+            raise
+    
+    def invalidate_snapshot(self):
+        """Drop the cached DOM snapshot of this driver"""
+        _snapshots.pop(self.driver, None)
@@ -1,8 +1,9 @@
 """
 Inventory Page Object
 """
-from selenium.webdriver.common.by import By
+from pages.locators import By
 from pages.base_page import BasePage
+from utils.product import Product
 
 
 class InventoryPage(BasePage):
@@ -14,6 +15,8 @@ class InventoryPage(BasePage):
     INVENTORY_ITEM_NAME = (By.CLASS_NAME, "inventory_item_name")
     INVENTORY_ITEM_PRICE = (By.CLASS_NAME, "inventory_item_price")
     INVENTORY_ITEM_DESCRIPTION = (By.CLASS_NAME, "inventory_item_desc")
+    INVENTORY_ITEM_IMAGE = (By.XPATH, ".//img[contains(@class, 'inventory_item_img')]")
+    INVENTORY_ITEM_LINK = (By.XPATH, ".//a[contains(@id, '_title_link')]")
     LOGOUT_BUTTON = (By.ID, "react-burger-menu-btn")
     LOGOUT_LINK = (By.ID, "logout_sidebar_link")
     MENU_BUTTON = (By.ID, "react-burger-menu-btn")
@@ -48,32 +51,21 @@ class InventoryPage(BasePage):
         products = []
         
         try:
-            items = self.find_elements(self.INVENTORY_ITEMS)
+            # Read every product from one DOM snapshot instead of
+            # one WebDriver call per field of every item
+            snapshot = self.capture_snapshot()
+            items = snapshot.find_all(self.INVENTORY_ITEMS)
             self.logger.info(f"Found {len(items)} products in inventory")
             
             for item in items:
                 product_data = {}
                 
-                # Extract product name
-                try:
-                    name_element = item.find_element(*self.INVENTORY_ITEM_NAME)
-                    product_data['name'] = name_element.text
-                except:
-                    product_data['name'] = "N/A"
-                
-                # Extract product description
-                try:
-                    desc_element = item.find_element(*self.INVENTORY_ITEM_DESCRIPTION)
-                    product_data['description'] = desc_element.text
-                except:
-                    product_data['description'] = "N/A"
-                
-                # Extract product price
-                try:
-                    price_element = item.find_element(*self.INVENTORY_ITEM_PRICE)
-                    product_data['price'] = price_element.text
-                except:
-                    product_data['price'] = "N/A"
+                # Extract product name, description and price
+                for field, locator in (('name', self.INVENTORY_ITEM_NAME),
+                                       ('description', self.INVENTORY_ITEM_DESCRIPTION),
+                                       ('price', self.INVENTORY_ITEM_PRICE)):
+                    text = snapshot.get_text(locator, root=item)
+                    product_data[field] = text if text is not None else "N/A"
                 
                 products.append(product_data)
             
@@ -85,6 +77,47 @@ class InventoryPage(BasePage):
         
         return products
     
+    def get_product_listing(self):
+        """
+        Get all products with their item ids and images
+        
+        Returns:
+            list: Dictionaries with item_id, name, description, price,
+                image_src and image_broken
+        """
+        listing = []
+        
+        try:
+            snapshot = self.capture_snapshot()
+            for item in snapshot.find_all(self.INVENTORY_ITEMS):
+                link_id = snapshot.get_attribute(self.INVENTORY_ITEM_LINK, "id", root=item) or ""
+                image = snapshot.find(self.INVENTORY_ITEM_IMAGE, root=item)
+                listing.append({
+                    'item_id': link_id.split("_")[1] if link_id.startswith("item_") else "N/A",
+                    'name': snapshot.get_text(self.INVENTORY_ITEM_NAME, root=item) or "N/A",
+                    'description': snapshot.get_text(self.INVENTORY_ITEM_DESCRIPTION, root=item) or "N/A",
+                    'price': snapshot.get_text(self.INVENTORY_ITEM_PRICE, root=item) or "N/A",
+                    'image_src': image.get("src", "N/A") if image is not None else "N/A",
+                    'image_broken': image is None or snapshot.is_image_broken(image)
+                })
+            
+            self.logger.info(f"Extracted listing of {len(listing)} products")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get product listing: {str(e)}")
+            raise
+        
+        return listing
+    
+    def get_products(self):
+        """
+        Get all products as typed records
+        
+        Returns:
+            list: Product objects with parsed item ids and prices
+        """
+        return [Product.from_dict(product) for product in self.get_product_listing()]
+    
     def logout(self):
         """Logout from the application"""
         try:
@@ -101,6 +134,7 @@ class InventoryPage(BasePage):
             self.driver.execute_script("arguments[0].scrollIntoView(true);", logout_element)
             time.sleep(0.5)
             self.driver.execute_script("arguments[0].click();", logout_element)
+            self.invalidate_snapshot()
             self.logger.info("Clicked logout button")
             
         except Exception as e:
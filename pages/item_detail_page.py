@@ -0,0 +1,64 @@
+"""
+Item Detail Page Object
+"""
+from pages.locators import By
+from pages.base_page import BasePage
+from config.settings import INVENTORY_ITEM_PAGE_URL
+
+
+class ItemDetailPage(BasePage):
+    """Page Object for Inventory Item Detail Page"""
+    
+    # Locators
+    ITEM_NAME = (By.CLASS_NAME, "inventory_details_name")
+    ITEM_DESCRIPTION = (By.CLASS_NAME, "inventory_details_desc")
+    ITEM_PRICE = (By.CLASS_NAME, "inventory_details_price")
+    ITEM_IMAGE = (By.CLASS_NAME, "inventory_details_img")
+    BACK_BUTTON = (By.ID, "back-to-products")
+    
+    def load(self, item_id):
+        """
+        Navigate to the detail page of an item
+        
+        Args:
+            item_id: Inventory item id
+        """
+        self.navigate_to(INVENTORY_ITEM_PAGE_URL.format(item_id=item_id))
+        self.logger.info(f"Item detail page loaded: {item_id}")
+    
+    def is_item_detail_page_loaded(self):
+        """
+        Check if item detail page is loaded
+        
+        Returns:
+            bool: True if item detail page is loaded
+        """
+        return self.is_element_visible(self.BACK_BUTTON)
+    
+    def get_item_details(self):
+        """
+        Get the details of the displayed item
+        
+        Returns:
+            dict: name, description, price, image_src and image_broken
+        """
+        try:
+            snapshot = self.capture_snapshot()
+            image = snapshot.find(self.ITEM_IMAGE)
+            details = {
+                'name': snapshot.get_text(self.ITEM_NAME) or "N/A",
+                'description': snapshot.get_text(self.ITEM_DESCRIPTION) or "N/A",
+                'price': snapshot.get_text(self.ITEM_PRICE) or "N/A",
+                'image_src': image.get("src", "N/A") if image is not None else "N/A",
+                'image_broken': image is None or snapshot.is_image_broken(image)
+            }
+            self.logger.info(f"Extracted details of item: {details['name']}")
+            return details
+        except Exception as e:
+            self.logger.error(f"Failed to get item details: {str(e)}")
+            raise
+    
+    def back_to_products(self):
+        """Return to the inventory page"""
+        self.click_element(self.BACK_BUTTON)
+        self.logger.info("Clicked back to products")
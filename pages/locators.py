@@ -0,0 +1,20 @@
+"""
+Locator strategies for page objects
+
+Mirrors selenium.webdriver.common.by.By. Importing that module loads the whole
+selenium.webdriver package, so page objects use these constants to keep test
+collection free of browser imports.
+"""
+
+
+class By:
+    """Set of supported locator strategies"""
+    
+    ID = "id"
+    XPATH = "xpath"
+    LINK_TEXT = "link text"
+    PARTIAL_LINK_TEXT = "partial link text"
+    NAME = "name"
+    TAG_NAME = "tag name"
+    CLASS_NAME = "class name"
+    CSS_SELECTOR = "css selector"
@@ -1,7 +1,7 @@
 """
 Login Page Object
 """
-from selenium.webdriver.common.by import By
+from pages.locators import By
 from pages.base_page import BasePage
 from config.settings import LOGIN_PAGE_URL
 
@@ -75,6 +75,28 @@ class LoginPage(BasePage):
         """
         return self.is_element_visible(self.LOGIN_LOGO)
     
+    def wait_for_login_result(self):
+        """
+        Wait until login either redirects to the inventory or shows an error
+        
+        Returns:
+            bool: True if login succeeded
+        """
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        try:
+            self.wait.until(EC.any_of(
+                EC.url_contains("inventory"),
+                EC.visibility_of_element_located(self.ERROR_MESSAGE)
+            ))
+        except Exception as e:
+            self.logger.error(f"No login result. Error: {str(e)}")
+            return False
+        
+        logged_in = "inventory" in self.get_current_url()
+        self.logger.info(f"Login successful: {logged_in}")
+        return logged_in
+    
     def login_user(self, username, password):
         """
         Perform login with username and password
@@ -0,0 +1,114 @@
+"""
+DOM Snapshot Queries
+Given a static inventory page annotated the way CAPTURE_SCRIPT marks it
+When locators are answered from the DomSnapshot instead of WebDriver
+Then class names match whole tokens, root= scopes searches, absolute XPaths work
+And hidden descendants, scripts and styles are left out of the text like WebElement.text
+"""
+
+import pytest
+import logging
+from pages.locators import By
+
+logger = logging.getLogger(__name__)
+
+# Every element carries data-snapshot-visible, like a captured page
+PAGE = """
+<html data-snapshot-visible="1">
+<head data-snapshot-visible="0">
+    <title data-snapshot-visible="0">Swag Labs</title>
+    <style data-snapshot-visible="0">.hidden { display: none }</style>
+</head>
+<body data-snapshot-visible="1">
+    <div class="app_logo" data-snapshot-visible="1">Swag Labs</div>
+    <div class="inventory_list" data-snapshot-visible="1">
+        <div class="inventory_item" data-snapshot-visible="1">
+            <div class="inventory_item_name " data-snapshot-visible="1">Sauce Labs Backpack<span
+                class="badge" data-snapshot-visible="0">HIDDEN</span></div>
+            <div class="inventory_item_price" data-snapshot-visible="1">$29.99</div>
+            <input class="quantity" data-snapshot-visible="1" data-snapshot-value="2" value="1"/>
+        </div>
+        <div class="inventory_item  sale" data-snapshot-visible="1">
+            <div class="inventory_item_name" data-snapshot-visible="1">Sauce <b data-snapshot-visible="1">Labs</b>
+                Bike Light<script data-snapshot-visible="0">var tracking = 1;</script><!-- note --></div>
+            <div class="inventory_item_price" data-snapshot-visible="1">$9.99</div>
+            <img class="inventory_item_img" src="/bike.jpg" data-snapshot-visible="1" data-snapshot-broken="1"/>
+        </div>
+        <div class="inventory_item" data-snapshot-visible="0">
+            <div class="inventory_item_name" data-snapshot-visible="0">Hidden Onesie</div>
+        </div>
+    </div>
+    <a id="logout_sidebar_link" href="#" data-snapshot-visible="1">Logout</a>
+</body>
+</html>
+"""
+
+ITEM = (By.CLASS_NAME, "inventory_item")
+ITEM_NAME = (By.CLASS_NAME, "inventory_item_name")
+
+
+@pytest.fixture
+def snapshot():
+    """Snapshot of the static page"""
+    pytest.importorskip("lxml")
+    from utils.dom_snapshot import DomSnapshot
+    return DomSnapshot(PAGE, url="https://www.saucedemo.com/inventory.html", title="Swag Labs")
+
+
+class TestDomSnapshot:
+    """Test class for DomSnapshot queries on a static page"""
+    
+    @pytest.mark.unit
+    def test_class_name_matches_whole_tokens(self, snapshot):
+        """
+        Check that inventory_item does not match inventory_item_name or _price
+        """
+        assert snapshot.count(ITEM) == 3
+        assert snapshot.count(ITEM_NAME) == 3
+        assert snapshot.count((By.CLASS_NAME, "sale")) == 1
+        assert snapshot.count((By.CLASS_NAME, "inventory")) == 0
+    
+    @pytest.mark.unit
+    def test_root_scopes_search(self, snapshot):
+        """
+        Check that searches with root= stay inside the given element
+        """
+        second = snapshot.find_all(ITEM)[1]
+        assert snapshot.get_text((By.CLASS_NAME, "inventory_item_price"), root=second) == "$9.99"
+        assert snapshot.find((By.CLASS_NAME, "quantity"), root=second) is None
+        assert len(snapshot.find_all((By.XPATH, ".//div"), root=second)) == 2
+        assert snapshot.get_attribute((By.TAG_NAME, "img"), "src", root=second) == "/bike.jpg"
+        assert snapshot.is_image_broken(snapshot.find((By.TAG_NAME, "img"), root=second))
+    
+    @pytest.mark.unit
+    def test_absolute_xpath(self, snapshot):
+        """
+        Check absolute XPaths, which search the whole document even with a root
+        """
+        locator = (By.XPATH, "/html/body/div[@class='inventory_list']/div[2]/div[2]")
+        assert snapshot.get_text(locator) == "$9.99"
+        
+        first = snapshot.find(ITEM)
+        assert snapshot.get_text((By.XPATH, "//a[@id='logout_sidebar_link']"), root=first) == "Logout"
+    
+    @pytest.mark.unit
+    def test_text_leaves_out_hidden_descendants(self, snapshot):
+        """
+        Check that text matches WebElement.text for hidden children, scripts and comments
+        """
+        assert snapshot.get_texts(ITEM_NAME) == ["Sauce Labs Backpack", "Sauce Labs Bike Light", ""]
+        assert "HIDDEN" not in snapshot.get_text(ITEM)
+        assert snapshot.get_text(ITEM) == "Sauce Labs Backpack $29.99"
+        assert snapshot.get_text((By.TAG_NAME, "head")) == ""
+    
+    @pytest.mark.unit
+    def test_visibility_and_form_values(self, snapshot):
+        """
+        Check visibility flags, captured form values and link text locators
+        """
+        assert snapshot.is_element_visible((By.CLASS_NAME, "app_logo"))
+        assert not snapshot.is_element_visible((By.TAG_NAME, "title"))
+        assert not snapshot.is_element_present((By.ID, "react-burger-menu-btn"))
+        assert snapshot.get_value((By.CLASS_NAME, "quantity")) == "2"
+        assert snapshot.find((By.LINK_TEXT, "Logout")) is not None
+        assert snapshot.find((By.PARTIAL_LINK_TEXT, "Log")) is not None
@@ -0,0 +1,121 @@
+"""
+Inventory Crawl: All Users
+Given the users in TEST_USERS
+When I crawl the inventory list and every item detail page of each user
+Then the data of all users is merged into one dataset
+And divergences from standard_user are reported
+"""
+
+import pytest
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from utils.inventory_crawler import InventoryCrawler
+from config.settings import EXTRACTED_DATA_FOLDER, CRAWLER_MAX_WORKERS, EXPECTED_PRICE_RANGE
+
+logger = logging.getLogger(__name__)
+
+
+class StandInCrawler(InventoryCrawler):
+    """Crawler whose workers log in and visit pages without a browser, counting logins"""
+
+    ITEMS_PER_USER = 12
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.logins = []
+        self._logins_lock = threading.Lock()
+
+    def _login(self, user, result):
+        if getattr(self._local, "user", None) != user:
+            with self._logins_lock:
+                self.logins.append(user)
+            self._local.user = user
+            time.sleep(0.01)
+        return object()
+
+    def _crawl_listing(self, user, result):
+        self._login(user, result)
+        listing = [{"item_id": str(i), "name": f"Item {i}"} for i in range(self.ITEMS_PER_USER)]
+        result.add_listing(user, listing)
+        return self._queue_chunks(user, [product["item_id"] for product in listing])
+
+    def _crawl_details(self, user, item_ids, result):
+        self._login(user, result)
+        for item_id in item_ids:
+            time.sleep(0.002)
+            result.add_details(user, item_id, {"name": f"Item {item_id}"})
+
+    def _quit_drivers(self):
+        pass
+
+
+class TestInventoryCrawl:
+    """Test class for the multi-user inventory crawl"""
+    
+    @pytest.mark.crawler
+    def test_crawl_all_users(self):
+        """
+        Crawl all users and compare them with standard_user
+        
+        This test verifies:
+        1. standard_user's list view and detail pages are extracted
+        2. locked_out_user is reported as a login error
+        3. problem_user diverges from standard_user
+        4. standard_user's prices are within the expected range
+        5. The dataset is saved to a JSON file
+        """
+        logger.info(f"Starting test: Inventory Crawl with {CRAWLER_MAX_WORKERS} workers")
+        
+        result = InventoryCrawler().crawl()
+        logger.info(f"✓ Crawled {len(result.records)} items in {result.elapsed:.1f}s")
+        
+        # Step 1: Verify standard_user was fully crawled
+        standard_items = result.items("standard_user")
+        assert len(standard_items) > 0, "No products found for standard_user"
+        assert all('detail' in record for record in standard_items.values()), \
+            "Not every item detail page of standard_user was crawled"
+        logger.info(f"✓ Extracted {len(standard_items)} items with details for standard_user")
+        
+        # Step 2: Verify locked out user is reported
+        assert "locked_out_user" in result.errors, "locked_out_user should fail to login"
+        logger.info(f"✓ locked_out_user error: {result.errors['locked_out_user']}")
+        
+        # Step 3: Verify problem_user divergences are found
+        divergences = result.compare_users("standard_user")
+        problem_divergences = [entry for entry in divergences if entry['user'] == "problem_user"]
+        assert problem_divergences, "Expected problem_user to diverge from standard_user"
+        logger.info(f"✓ Found {len(problem_divergences)} divergences for problem_user")
+        
+        # Step 4: Verify standard_user's prices
+        dataset = result.to_dataset()
+        invalid_prices = dataset.prices_out_of_range(*EXPECTED_PRICE_RANGE, group="standard_user")
+        assert not invalid_prices, f"Prices of standard_user outside {EXPECTED_PRICE_RANGE}: {invalid_prices}"
+        logger.info(f"✓ All {len(standard_items)} prices of standard_user within {EXPECTED_PRICE_RANGE}")
+        
+        # Step 5: Save the dataset
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        json_file = result.save_json(os.path.join(EXTRACTED_DATA_FOLDER, f"inventory_crawl_{timestamp}.json"))
+        logger.info(f"✓ Saved crawl dataset to JSON: {json_file}")
+    
+    @pytest.mark.unit
+    def test_detail_tasks_stay_with_logged_in_worker(self):
+        """
+        Check that detail chunks go to workers already logged in as their user
+        
+        A worker only logs in again once its user's chunks are all taken, so
+        it switches user at most once per user.
+        """
+        users = ["standard_user", "problem_user", "visual_user"]
+        crawler = StandInCrawler(users=users, max_workers=3, items_per_task=2)
+        result = crawler.crawl()
+        
+        assert not result.errors
+        for user in users:
+            assert all('detail' in record for record in result.items(user).values()), f"{user} not fully crawled"
+        
+        tasks = len(users) * (1 + StandInCrawler.ITEMS_PER_USER // 2)
+        assert len(crawler.logins) <= len(users) * crawler.max_workers < tasks, \
+            f"{len(crawler.logins)} logins for {tasks} tasks"
@@ -0,0 +1,185 @@
+"""
+Product Records and Inventory Dataset
+Given hand-written product dictionaries as extracted from the inventory page
+When they are parsed into Product records and stored in an InventoryDataset
+Then prices and item ids are parsed, missing values are kept as gaps
+And sort order, price range and group comparison agree with and without NumPy
+"""
+
+import math
+import pytest
+import logging
+
+logger = logging.getLogger(__name__)
+
+STANDARD = [
+    {"item_id": "4", "name": "Sauce Labs Backpack", "description": "Carry all the things", "price": "$29.99"},
+    {"item_id": "0", "name": "Sauce Labs Bike Light", "description": "A red light", "price": "$9.99"},
+    {"item_id": "1", "name": "Sauce Labs Bolt T-Shirt", "description": "Bolt", "price": "$15.99"},
+]
+
+
+@pytest.fixture
+def product_module():
+    """The product module"""
+    import utils.product
+    return utils.product
+
+
+@pytest.fixture(params=["numpy", "python"])
+def inventory_dataset(request, monkeypatch):
+    """The dataset module, once with NumPy and once with the pure Python fallback"""
+    import utils.inventory_dataset
+    if request.param == "numpy":
+        if utils.inventory_dataset.np is None:
+            pytest.skip("NumPy is not installed")
+    else:
+        monkeypatch.setattr(utils.inventory_dataset, "np", None)
+    return utils.inventory_dataset
+
+
+def products(*prices):
+    """Products with item ids 0, 1, ... and the given displayed prices"""
+    return [{"item_id": str(index), "name": f"Item {index}", "description": "", "price": price}
+            for index, price in enumerate(prices)]
+
+
+class TestProduct:
+    """Test class for the Product record"""
+    
+    @pytest.mark.unit
+    def test_parse_price(self, product_module):
+        """
+        Check displayed prices, thousands separators and missing prices
+        """
+        assert product_module.parse_price("$29.99") == 29.99
+        assert product_module.parse_price(" $1,299.00 ") == 1299.0
+        assert product_module.parse_price("N/A") is None
+        assert product_module.parse_price("") is None
+        assert product_module.parse_price(None) is None
+        assert product_module.parse_price("free") is None
+    
+    @pytest.mark.unit
+    def test_parse_item_id(self, product_module):
+        """
+        Check extracted item ids and missing ids
+        """
+        assert product_module.parse_item_id("4") == 4
+        assert product_module.parse_item_id(5) == 5
+        assert product_module.parse_item_id("N/A") is None
+        assert product_module.parse_item_id(None) is None
+        assert product_module.parse_item_id("item_4") is None
+    
+    @pytest.mark.unit
+    def test_from_dict_and_normalized_to_dict(self, product_module):
+        """
+        Check parsing and the normalized string form of to_dict()
+        """
+        product = product_module.Product.from_dict(
+            {"item_id": "4", "name": "Backpack", "description": "N/A", "price": "$1,299.0"})
+        assert (product.item_id, product.name, product.description, product.price) == (4, "Backpack", None, 1299.0)
+        assert product.to_dict() == {
+            "item_id": "4", "name": "Backpack", "description": "N/A", "price": "$1,299.00"
+        }
+        
+        empty = product_module.Product()
+        assert set(empty.to_dict().values()) == {"N/A"}
+    
+    @pytest.mark.unit
+    def test_equality_and_hash(self, product_module):
+        """
+        Check that products compare and hash by value
+        """
+        first = product_module.Product.from_dict(STANDARD[0])
+        same = product_module.Product.from_dict(dict(STANDARD[0], price="29.99"))
+        other = product_module.Product.from_dict(STANDARD[1])
+        
+        assert first == same and hash(first) == hash(same)
+        assert first != other
+        assert first != STANDARD[0], "A product never equals its raw dictionary"
+        assert len({first, same, other}) == 2
+
+
+class TestInventoryDataset:
+    """Test class for InventoryDataset with and without NumPy"""
+    
+    @pytest.mark.unit
+    def test_rows_and_products_per_group(self, inventory_dataset):
+        """
+        Check group rows and rebuilt products, including missing values
+        """
+        dataset = inventory_dataset.InventoryDataset.from_products(STANDARD, "standard_user")
+        dataset.extend([{"item_id": "N/A", "name": "Broken", "description": "", "price": "N/A"}], "problem_user")
+        
+        assert len(dataset) == 4
+        assert dataset.rows("standard_user") == [0, 1, 2]
+        assert dataset.rows("problem_user") == [3]
+        assert dataset.rows() == [0, 1, 2, 3]
+        with pytest.raises(KeyError):
+            dataset.rows("visual_user")
+        
+        broken, = dataset.products("problem_user")
+        assert broken.item_id is None and broken.price is None
+        assert dataset.product(0).to_dict() == dict(STANDARD[0])
+    
+    @pytest.mark.unit
+    def test_sort_order_skips_missing_prices(self, inventory_dataset):
+        """
+        Check the sort order check, with NaN gaps for missing prices
+        """
+        dataset = inventory_dataset.InventoryDataset.from_products(
+            products("$7.99", "N/A", "$9.99", "$15.99", "N/A", "$29.99"), "low_to_high")
+        dataset.extend(products("$9.99", "$7.99", "N/A", "$29.99", "$15.99"), "shuffled")
+        
+        assert dataset.is_sorted_by_price("low_to_high")
+        assert not dataset.is_sorted_by_price("low_to_high", descending=True)
+        # Rows 6-10: 29.99 breaks nothing, 7.99 after 9.99 and 15.99 after 29.99 do
+        assert dataset.unsorted_rows("shuffled") == [7, 10]
+        assert dataset.unsorted_rows("shuffled", descending=True) == [9]
+    
+    @pytest.mark.unit
+    def test_prices_out_of_range_reports_missing(self, inventory_dataset):
+        """
+        Check that prices outside the range and missing prices are reported
+        """
+        dataset = inventory_dataset.InventoryDataset.from_products(
+            products("$29.99", "$0.00", "N/A", "$100.00", "$100.01"), "problem_user")
+        
+        invalid = dataset.prices_out_of_range(0.01, 100.00)
+        assert [product.item_id for product in invalid] == [1, 2, 4]
+        assert math.isnan(dataset.prices[2])
+        assert invalid[1].price is None
+    
+    @pytest.mark.unit
+    def test_compare_groups_by_item_id(self, inventory_dataset):
+        """
+        Check divergences, including items missing on either side
+        """
+        dataset = inventory_dataset.InventoryDataset.from_products(STANDARD, "standard_user")
+        changed = [
+            dict(STANDARD[1], price="$8.99"),
+            dict(STANDARD[0], name="Sauce Labs Backpack!"),
+            {"item_id": "5", "name": "Sauce Labs Onesie", "description": "", "price": "$7.99"},
+        ]
+        dataset.extend(changed, "problem_user")
+        
+        divergences = dataset.compare("problem_user", "standard_user")
+        assert divergences == [
+            {"item_id": 0, "field": "price", "expected": "$9.99", "actual": "$8.99"},
+            {"item_id": 4, "field": "name", "expected": "Sauce Labs Backpack", "actual": "Sauce Labs Backpack!"},
+            {"item_id": 1, "field": "item", "expected": "Sauce Labs Bolt T-Shirt", "actual": None},
+            {"item_id": 5, "field": "item", "expected": None, "actual": "Sauce Labs Onesie"},
+        ]
+        assert dataset.compare("standard_user", "standard_user") == []
+    
+    @pytest.mark.unit
+    def test_compare_treats_two_missing_prices_as_equal(self, inventory_dataset):
+        """
+        Check that a price missing in both groups is no divergence
+        """
+        dataset = inventory_dataset.InventoryDataset.from_products(products("N/A", "$9.99"), "before")
+        dataset.extend(products("N/A", "N/A"), "after")
+        
+        assert dataset.compare("after", "before", fields=("price",)) == [
+            {"item_id": 1, "field": "price", "expected": "$9.99", "actual": "N/A"},
+        ]
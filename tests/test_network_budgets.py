@@ -0,0 +1,63 @@
+"""
+Network Budgets: Login and Inventory Pages
+Given a user from TEST_USERS that can log in
+When I load the Demo Login Page and log in
+Then the requests of the login page stay within their network budget
+And the requests of the inventory page stay within their network budget
+"""
+
+import pytest
+import logging
+from pages.login_page import LoginPage
+from pages.inventory_page import InventoryPage
+from config.settings import TEST_USERS
+
+logger = logging.getLogger(__name__)
+
+# locked_out_user never reaches the inventory page
+USERS = [user for user in TEST_USERS if user != "locked_out_user"]
+
+
+class TestNetworkBudgets:
+    """Test class for the per-page network budgets"""
+    
+    @pytest.mark.network
+    @pytest.mark.parametrize("user", USERS)
+    def test_page_network_budgets(self, driver, network_capture, user):
+        """
+        Check the network budgets of the login and inventory pages
+        
+        This test verifies:
+        1. The login page loads within its request, size and latency budget
+        2. The user is redirected to the inventory page
+        3. The inventory page loads within its request, size and latency budget
+        """
+        logger.info(f"Starting test: Network Budgets for {user}")
+        
+        # Step 1: Load the login page and check its budget
+        network_capture.start_page("login", user=user)
+        login_page = LoginPage(driver)
+        login_page.load()
+        assert login_page.is_login_page_loaded(), "Failed to load login page"
+        assert network_capture.wait_for_idle(), "Login page network did not go idle"
+        
+        violations = network_capture.check_budget("login")
+        assert not violations, f"Login page over network budget: {violations}"
+        logger.info(f"✓ Login page within budget: {network_capture.page_summary('login')}")
+        
+        # Step 2: Log in
+        network_capture.start_page("inventory")
+        credentials = TEST_USERS[user]
+        login_page.login_user(credentials['username'], credentials['password'])
+        assert login_page.wait_for_login_result(), f"{user} could not log in"
+        
+        inventory_page = InventoryPage(driver)
+        assert inventory_page.is_inventory_page_loaded(), "Failed to load inventory page"
+        logger.info("✓ Successfully redirected to inventory page")
+        
+        # Step 3: Check the inventory page budget once its images have loaded
+        assert network_capture.wait_for_idle(), "Inventory page network did not go idle"
+        violations = network_capture.check_budget("inventory")
+        assert not violations, f"Inventory page over network budget: {violations}"
+        logger.info(f"✓ Inventory page within budget: {network_capture.page_summary('inventory')}")
+
@@ -21,6 +21,7 @@ class TestScenario1:
     
     @pytest.mark.scenario1
     @pytest.mark.login
+    @pytest.mark.command_budget(30)
     def test_successful_login(self, driver):
         """
         Test successful login with standard user credentials
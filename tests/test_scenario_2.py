@@ -19,6 +19,7 @@ class TestScenario2:
     
     @pytest.mark.scenario2
     @pytest.mark.login
+    @pytest.mark.command_budget(30)
     def test_failed_login_locked_out_user(self, driver):
         """
         Test failed login with locked out user credentials
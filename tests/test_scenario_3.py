@@ -25,6 +25,7 @@ class TestScenario3:
     """Test class for Scenario 3: Extract Data from Inventory"""
     
     @pytest.mark.scenario3
+    @pytest.mark.command_budget(30)
     def test_extract_and_save_inventory_data(self, driver):
         """
         Test extracting inventory data and saving to files
@@ -0,0 +1,67 @@
+"""
+Trace Clock Alignment
+Given a stand-in driver whose browser trace clock runs 7 seconds behind Python's
+When a clock sync mark is placed and the browser trace events are collected
+Then browser events are shifted onto the clock of the Python spans
+And events stay unshifted when no sync mark was traced
+"""
+
+import json
+import pytest
+import logging
+from utils.trace_recorder import TraceRecorder
+
+logger = logging.getLogger(__name__)
+
+BROWSER_CLOCK_OFFSET = 7_000_000
+
+
+class StandInDriver:
+    """Answers execute_script and the performance log like a traced Chrome"""
+
+    def __init__(self, trace_marks=True):
+        self.trace_marks = trace_marks
+        self.events = [{"name": "ParseHTML", "cat": "devtools.timeline", "ph": "X", "ts": 1000, "dur": 50},
+                       {"name": "thread_name", "cat": "__metadata", "ph": "M", "ts": 0}]
+
+    def execute_script(self, script, *args):
+        if self.trace_marks and script.startswith("performance.mark"):
+            self.events.append({"name": args[0], "cat": "blink.user_timing", "ph": "R",
+                                "ts": TraceRecorder.now() - BROWSER_CLOCK_OFFSET})
+
+    def get_log(self, log_type):
+        message = {"message": {"method": "Tracing.dataCollected", "params": {"value": self.events}}}
+        self.events = []
+        return [{"message": json.dumps(message)}]
+
+
+class TestTraceRecorder:
+    """Test class for aligning browser trace events with Python spans"""
+    
+    @pytest.mark.unit
+    def test_browser_events_shifted_by_sync_mark(self):
+        """
+        Check that browser timestamps are moved onto the Python clock
+        """
+        driver = StandInDriver()
+        recorder = TraceRecorder("test")
+        recorder.sync_clock(driver)
+        recorder.collect_browser_events(driver)
+        
+        parse, metadata, mark = recorder.browser_events
+        assert mark["ts"] == recorder._sync_time
+        # Off by at most half the execute_script round trip
+        assert abs(parse["ts"] - 1000 - BROWSER_CLOCK_OFFSET) < 1000
+        assert metadata["ts"] == 0, "Metadata events keep their timestamp"
+    
+    @pytest.mark.unit
+    def test_events_unshifted_without_sync_mark(self):
+        """
+        Check that events are kept as read when the mark is missing from the trace
+        """
+        driver = StandInDriver(trace_marks=False)
+        recorder = TraceRecorder("test")
+        recorder.sync_clock(driver)
+        recorder.collect_browser_events(driver)
+        
+        assert [event["ts"] for event in recorder.browser_events] == [1000, 0]
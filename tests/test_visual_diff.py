@@ -0,0 +1,263 @@
+"""
+Visual Diff Engine
+Given synthetic RGB arrays instead of browser screenshots
+When they are averaged, hashed, diffed and compared with stored baselines
+Then block means, hash distances, scores and masks match the known changes
+And most comparisons finish without decoding the baseline image
+"""
+
+import io
+import os
+import json
+import pytest
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def np():
+    """NumPy, imported here so collecting tests does not load it"""
+    return pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def visual_diff():
+    """The visual diff module"""
+    pytest.importorskip("PIL")
+    import utils.visual_diff
+    return utils.visual_diff
+
+
+@pytest.fixture
+def page(np):
+    """Synthetic 120x160 'page': light background, a dark header and four cards on the left"""
+    image = np.full((120, 160, 3), 230, dtype=np.uint8)
+    image[:12] = 40
+    for top, left in ((24, 10), (24, 70), (72, 10), (72, 70)):
+        image[top:top + 36, left:left + 40] = (90, 60, 160)
+    return image
+
+
+def encode_png(image):
+    """Encode an RGB array as PNG bytes"""
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class TestVisualDiffFunctions:
+    """Test class for the array functions of the visual diff engine"""
+    
+    @pytest.mark.unit
+    def test_block_mean_even_blocks(self, np, visual_diff):
+        """
+        Check block averages on a grid that divides the array evenly
+        """
+        array = np.arange(16, dtype=np.float64).reshape(4, 4)
+        means = visual_diff.block_mean(array, 2, 2)
+        assert means.tolist() == [[2.5, 4.5], [10.5, 12.5]]
+    
+    @pytest.mark.unit
+    def test_block_mean_uneven_and_small_arrays(self, np, visual_diff):
+        """
+        Check uneven blocks and arrays smaller than the grid
+        """
+        array = np.ones((5, 7))
+        array[:, 4:] = 3
+        means = visual_diff.block_mean(array, 2, 2)
+        assert means.shape == (2, 2)
+        # Column edges are 0, 3 and 7: the second block holds one 1 and three 3s
+        assert np.allclose(means[:, 0], 1.0)
+        assert np.allclose(means[:, 1], 2.5)
+        
+        # A 2x2 array on an 8x8 grid repeats its pixels instead of dividing by zero
+        small = visual_diff.block_mean(np.array([[0.0, 1.0], [2.0, 3.0]]), 8, 8)
+        assert small.shape == (8, 8)
+        assert np.isfinite(small).all()
+    
+    @pytest.mark.unit
+    def test_perceptual_hash_distances(self, np, visual_diff, page):
+        """
+        Check that the hash ignores small changes and separates different layouts
+        """
+        base_hash = visual_diff.perceptual_hash(page)
+        assert visual_diff.hash_distance(base_hash, visual_diff.perceptual_hash(page.copy())) == 0
+        
+        # A few changed pixels, like a different price text, stay below the failure distance
+        small_change = page.copy()
+        small_change[40:42, 20:24] = 0
+        distance = visual_diff.hash_distance(base_hash, visual_diff.perceptual_hash(small_change))
+        assert distance < visual_diff.VISUAL_HASH_FAIL_DISTANCE
+        
+        # A mirrored layout is far away
+        mirrored = page[:, ::-1].copy()
+        distance = visual_diff.hash_distance(base_hash, visual_diff.perceptual_hash(mirrored))
+        assert distance >= visual_diff.VISUAL_HASH_FAIL_DISTANCE
+        assert 0 <= base_hash < 2 ** 64
+    
+    @pytest.mark.unit
+    def test_diff_scores_changed_pixels(self, np, visual_diff, page):
+        """
+        Check score, mask, region scores and the per-channel tolerance of diff()
+        """
+        comparator = visual_diff.VisualComparator()
+        changed = page.copy()
+        changed[:, :] += 5
+        # Top left region of the 8x8 grid
+        changed[0:15, 0:20] = 255
+        
+        result = comparator.diff("page", changed, page)
+        assert result.mask.sum() == 15 * 20, "Differences within the tolerance must be ignored"
+        assert result.score == pytest.approx(15 * 20 / (120 * 160))
+        assert not result.passed
+        
+        row, col, score = result.changed_regions()[0]
+        assert (row, col) == (0, 0)
+        assert score == pytest.approx(1.0)
+        
+        identical = comparator.diff("page", page, page.copy())
+        assert identical.score == 0.0 and identical.passed
+    
+    @pytest.mark.unit
+    def test_diff_size_mismatch(self, np, visual_diff, page):
+        """
+        Check that screenshots of another size fail completely
+        """
+        result = visual_diff.VisualComparator().diff("page", page, page[:60])
+        assert result.score == 1.0
+        assert result.mask.all()
+
+
+class TestVisualComparator:
+    """Test class for baseline comparison and the hash index"""
+    
+    @pytest.fixture
+    def decode_counter(self, visual_diff, monkeypatch):
+        """Count PNG decodes done by the comparator"""
+        calls = []
+        decode_png = visual_diff.decode_png
+        
+        def counting_decode(png_bytes):
+            calls.append(len(png_bytes))
+            return decode_png(png_bytes)
+        
+        monkeypatch.setattr(visual_diff, "decode_png", counting_decode)
+        return calls
+    
+    @pytest.mark.unit
+    def test_identical_screenshot_skips_baseline_decode(self, visual_diff, page, tmp_path, decode_counter):
+        """
+        Check that equal pixels match on the cached digest
+        """
+        comparator = visual_diff.VisualComparator(str(tmp_path))
+        assert comparator.compare("page", encode_png(page)).baseline_created
+        
+        decode_counter.clear()
+        result = comparator.compare("page", encode_png(page))
+        assert result.passed and result.score == 0.0
+        assert len(decode_counter) == 1, "Only the screenshot should be decoded"
+    
+    @pytest.mark.unit
+    def test_distant_hash_fails_without_baseline_decode(self, visual_diff, page, tmp_path, decode_counter):
+        """
+        Check that a clearly different screenshot fails on the hash and decodes the baseline on demand
+        """
+        comparator = visual_diff.VisualComparator(str(tmp_path))
+        comparator.compare("page", encode_png(page))
+        
+        decode_counter.clear()
+        result = comparator.compare("page", encode_png(page[:, ::-1].copy()))
+        assert result.decided_by_hash and not result.passed
+        assert len(decode_counter) == 1, "The baseline should not be decoded"
+        assert "pending" in repr(result)
+        
+        # The mask of a failure is still available
+        assert result.score > 0.1
+        assert result.mask.shape == page.shape[:2]
+        assert len(decode_counter) == 2
+    
+    @pytest.mark.unit
+    def test_close_screenshot_gets_pixel_diff(self, visual_diff, page, tmp_path, decode_counter):
+        """
+        Check that a small change is found by the pixel diff the hash cannot see
+        """
+        comparator = visual_diff.VisualComparator(str(tmp_path))
+        comparator.compare("page", encode_png(page))
+        
+        changed = page.copy()
+        changed[40:44, 20:30] = 0
+        decode_counter.clear()
+        result = comparator.compare("page", encode_png(changed))
+        assert not result.decided_by_hash
+        assert len(decode_counter) == 2
+        assert result.mask.sum() == 40 and not result.passed
+    
+    @pytest.mark.unit
+    def test_size_change_fails_without_baseline_decode(self, visual_diff, page, tmp_path, decode_counter):
+        """
+        Check that the cached baseline shape fails resized screenshots
+        """
+        comparator = visual_diff.VisualComparator(str(tmp_path))
+        comparator.compare("page", encode_png(page))
+        
+        decode_counter.clear()
+        result = comparator.compare("page", encode_png(page[:60]))
+        assert result.score == 1.0 and not result.passed
+        assert len(decode_counter) == 1
+    
+    @pytest.mark.unit
+    def test_index_merged_across_comparators(self, visual_diff, page, tmp_path):
+        """
+        Check that comparators sharing a folder, like xdist workers, keep each other's index entries
+        """
+        first = visual_diff.VisualComparator(str(tmp_path))
+        second = visual_diff.VisualComparator(str(tmp_path))
+        
+        # Both load the index before either has written it
+        assert first.compare("missing", encode_png(page), create_missing=False) is None
+        assert second.compare("missing", encode_png(page), create_missing=False) is None
+        
+        first.compare("page_a", encode_png(page))
+        second.compare("page_b", encode_png(page[:, ::-1].copy()))
+        
+        with open(tmp_path / visual_diff.HASH_INDEX_FILE) as f:
+            index = json.load(f)
+        assert set(index) == {"page_a", "page_b"}
+    
+    @pytest.mark.unit
+    def test_index_survives_new_mtime(self, visual_diff, page, tmp_path, decode_counter):
+        """
+        Check that a baseline with a new mtime, as after a fresh checkout, keeps its index entry
+        """
+        comparator = visual_diff.VisualComparator(str(tmp_path))
+        comparator.compare("page", encode_png(page))
+        os.utime(comparator.baseline_path("page"), ns=(0, 0))
+        
+        decode_counter.clear()
+        fresh = visual_diff.VisualComparator(str(tmp_path))
+        assert fresh.compare("page", encode_png(page)).passed
+        assert len(decode_counter) == 1, "The baseline should not be re-indexed"
+        
+        # A baseline file replaced outside the comparator is re-indexed
+        with open(fresh.baseline_path("page"), "wb") as f:
+            f.write(encode_png(page[:, ::-1].copy()))
+        decode_counter.clear()
+        assert fresh.compare("page", encode_png(page[:, ::-1].copy())).passed
+        assert len(decode_counter) == 2
+    
+    @pytest.mark.unit
+    def test_update_baseline_replaces_differing_baseline(self, visual_diff, page, tmp_path):
+        """
+        Check that update_baseline stores a differing screenshot as the new baseline
+        """
+        comparator = visual_diff.VisualComparator(str(tmp_path))
+        comparator.compare("page", encode_png(page))
+        mirrored = encode_png(page[:, ::-1].copy())
+        
+        assert not comparator.compare("page", mirrored).passed
+        updated = comparator.compare("page", mirrored, update_baseline=True)
+        assert updated.passed and updated.baseline_created
+        assert comparator.compare("page", mirrored).passed
+        assert not comparator.compare("page", encode_png(page)).baseline_created
@@ -0,0 +1,93 @@
+"""
+Visual Regression: Inventory Page per User
+Given I am logged in as a user
+When I am on the inventory page
+Then the page looks the same as that user's stored baseline
+And users that render differently from standard_user are reported
+"""
+
+import pytest
+import logging
+import os
+from pages.login_page import LoginPage
+from pages.inventory_page import InventoryPage
+from config.settings import TEST_USERS, VISUAL_DIFF_FOLDER
+
+logger = logging.getLogger(__name__)
+
+VISUAL_USERS = ["standard_user", "problem_user", "visual_user"]
+
+
+def login_and_capture_inventory(driver, user_key):
+    """
+    Login as a user and take a screenshot of the inventory page
+
+    Args:
+        driver: WebDriver instance
+        user_key: Key of the user in TEST_USERS
+
+    Returns:
+        bytes: Screenshot PNG content
+    """
+    user = TEST_USERS[user_key]
+    login_page = LoginPage(driver)
+    login_page.load()
+    login_page.login_user(user['username'], user['password'])
+
+    inventory_page = InventoryPage(driver)
+    assert inventory_page.is_inventory_page_loaded(), "Failed to load inventory page"
+    return driver.get_screenshot_as_png()
+
+
+class TestVisualRegression:
+    """Test class for visual regression of the inventory page"""
+
+    @pytest.mark.visual
+    @pytest.mark.parametrize("user_key", VISUAL_USERS)
+    def test_inventory_matches_baseline(self, driver, visual_comparator, pytestconfig, user_key):
+        """
+        Compare the inventory page of a user with its baseline
+
+        A missing baseline fails the test; --update-baselines stores the
+        screenshot as baseline instead.
+        """
+        logger.info(f"Starting test: Visual Regression - {user_key}")
+
+        update = pytestconfig.getoption("--update-baselines")
+        screenshot = login_and_capture_inventory(driver, user_key)
+        result = visual_comparator.compare(f"inventory_page_{user_key}", screenshot,
+                                           create_missing=update, update_baseline=update)
+        assert result is not None, f"No visual baseline for {user_key}, run with --update-baselines to store it"
+        logger.info(f"✓ Compared with baseline: {result}")
+
+        if not result.passed:
+            mask_path = result.save_mask(os.path.join(VISUAL_DIFF_FOLDER, f"inventory_page_{user_key}_mask.png"))
+            logger.info(f"Diff mask saved: {mask_path}")
+
+        assert result.passed, \
+            f"Inventory page of {user_key} differs from baseline: {result}, regions: {result.changed_regions()[:5]}"
+
+    @pytest.mark.visual
+    @pytest.mark.parametrize("user_key", ["problem_user", "visual_user"])
+    def test_user_differs_from_standard_user(self, driver, visual_comparator, pytestconfig, user_key):
+        """
+        Verify that the problem and visual users render differently from standard_user
+        """
+        logger.info(f"Starting test: Visual Divergence - {user_key}")
+
+        # Make sure the standard_user baseline exists and still matches
+        update = pytestconfig.getoption("--update-baselines")
+        standard = visual_comparator.compare("inventory_page_standard_user",
+                                             login_and_capture_inventory(driver, "standard_user"),
+                                             create_missing=update, update_baseline=update)
+        assert standard is not None, "No visual baseline for standard_user, run with --update-baselines to store it"
+        assert standard.passed, f"standard_user differs from its baseline: {standard}"
+        driver.delete_all_cookies()
+
+        screenshot = login_and_capture_inventory(driver, user_key)
+        result = visual_comparator.compare(f"inventory_page_{user_key}_vs_standard_user", screenshot,
+                                           baseline_name="inventory_page_standard_user")
+        result.save_mask(os.path.join(VISUAL_DIFF_FOLDER, f"inventory_page_{user_key}_vs_standard_user_mask.png"))
+
+        assert not result.passed, f"{user_key} renders the same as standard_user: {result}"
+        logger.info(f"✓ {user_key} differs from standard_user in regions: {result.changed_regions()[:5]}")
@@ -0,0 +1,113 @@
+"""
+WebDriver Replay
+Given a small hand-built WebDriver recording
+When its commands are sent to a ReplayConnection
+Then responses come back in recorded order
+And extra polls keep getting the last recorded response
+And commands that were never recorded fail with ReplayMismatchError
+"""
+
+import json
+import pytest
+import logging
+from utils.webdriver_recording import (
+    ReplayConnection, ReplayMismatchError, WebDriverRecorder, recording_path
+)
+
+logger = logging.getLogger(__name__)
+
+SESSION_ID = "recorded-session"
+CAPABILITIES = {"browserName": "chrome"}
+ELEMENT = {"element-6066-11e4-a52e-4f735466cecf": "error-message"}
+FIND_ERROR = {"using": "xpath", "value": "//h3[@data-test='error']", "sessionId": SESSION_ID}
+
+ENTRIES = [
+    {"c": "get", "p": {"url": "https://www.saucedemo.com/", "sessionId": SESSION_ID}, "r": {"value": None}},
+    {"c": "getCurrentUrl", "p": {"sessionId": SESSION_ID}, "r": {"value": "https://www.saucedemo.com/"}},
+    {"c": "findElement", "p": FIND_ERROR, "r": {"value": None}},
+    {"c": "findElement", "p": FIND_ERROR, "r": {"value": ELEMENT}},
+    {"c": "getCurrentUrl", "p": {"sessionId": SESSION_ID}, "r": {"value": "https://www.saucedemo.com/inventory.html"}},
+]
+
+
+@pytest.fixture
+def connection():
+    """Replay connection serving the hand-built recording"""
+    return ReplayConnection(SESSION_ID, CAPABILITIES, ENTRIES)
+
+
+class TestReplayConnection:
+    """Test class for ReplayConnection"""
+    
+    @pytest.mark.unit
+    def test_responses_served_in_recorded_order(self, connection):
+        """
+        Check that repeated requests get their responses in recorded order
+        """
+        assert connection.execute("getCurrentUrl", {"sessionId": SESSION_ID})["value"] == "https://www.saucedemo.com/"
+        assert connection.execute("findElement", dict(FIND_ERROR))["value"] is None
+        assert connection.execute("findElement", dict(FIND_ERROR))["value"] == ELEMENT
+        assert connection.execute("getCurrentUrl", {"sessionId": SESSION_ID})["value"] == \
+            "https://www.saucedemo.com/inventory.html"
+    
+    @pytest.mark.unit
+    def test_last_response_repeated_for_extra_polls(self, connection):
+        """
+        Check that a wait loop polling more often than during recording keeps working
+        """
+        responses = [connection.execute("findElement", dict(FIND_ERROR))["value"] for _ in range(5)]
+        assert responses == [None, ELEMENT, ELEMENT, ELEMENT, ELEMENT]
+    
+    @pytest.mark.unit
+    def test_session_id_ignored(self, connection):
+        """
+        Check that requests match regardless of the session id of the replay driver
+        """
+        response = connection.execute("get", {"url": "https://www.saucedemo.com/", "sessionId": "replayed-session"})
+        assert response == {"value": None}
+    
+    @pytest.mark.unit
+    def test_new_session_and_quit_without_recording(self, connection):
+        """
+        Check that session start and quit work without recorded entries
+        """
+        session = connection.execute("newSession", {"capabilities": {}})
+        assert session == {"value": {"sessionId": SESSION_ID, "capabilities": CAPABILITIES}}
+        assert connection.execute("quit", {"sessionId": SESSION_ID}) == {"value": None}
+    
+    @pytest.mark.unit
+    def test_unrecorded_command_raises_mismatch(self, connection):
+        """
+        Check that commands and parameters that were never recorded fail the test
+        """
+        with pytest.raises(ReplayMismatchError, match="clickElement"):
+            connection.execute("clickElement", {"id": "login-button", "sessionId": SESSION_ID})
+        
+        with pytest.raises(ReplayMismatchError, match="inventory"):
+            connection.execute("get", {"url": "https://www.saucedemo.com/inventory.html", "sessionId": SESSION_ID})
+    
+    @pytest.mark.unit
+    def test_responses_not_shared_with_caller(self, connection):
+        """
+        Check that changes selenium makes to a response do not leak into later replies
+        """
+        for _ in range(2):
+            connection.execute("findElement", dict(FIND_ERROR))
+        connection.execute("findElement", dict(FIND_ERROR))["value"]["element-6066-11e4-a52e-4f735466cecf"] = "changed"
+        assert connection.execute("findElement", dict(FIND_ERROR))["value"] == ELEMENT
+    
+    @pytest.mark.unit
+    def test_saved_recording_loads(self, tmp_path):
+        """
+        Check that a recording saved by WebDriverRecorder replays the same responses
+        """
+        recorder = WebDriverRecorder()
+        recorder.session_id = SESSION_ID
+        recorder.capabilities = CAPABILITIES
+        recorder.entries = [json.dumps(entry) for entry in ENTRIES]
+        path = recorder.save(recording_path(str(tmp_path), "tests/test_login.py::TestLogin::test_login"))
+        
+        connection = ReplayConnection.load(path)
+        assert connection.session_id == SESSION_ID
+        assert connection.execute("findElement", dict(FIND_ERROR))["value"] is None
+        assert connection.execute("findElement", dict(FIND_ERROR))["value"] == ELEMENT
@@ -0,0 +1,140 @@
+"""
+WebDriver command counting per test and per page-object method
+"""
+import os
+import sys
+from collections import Counter
+from selenium.webdriver.remote.command import Command
+from pages.base_page import BasePage
+from utils.trace_recorder import traced
+
+COMMAND_TYPES = {
+    Command.FIND_ELEMENT: "find",
+    Command.FIND_ELEMENTS: "find",
+    Command.FIND_CHILD_ELEMENT: "find",
+    Command.FIND_CHILD_ELEMENTS: "find",
+    Command.CLICK_ELEMENT: "click",
+    Command.SEND_KEYS_TO_ELEMENT: "sendKeys",
+    Command.GET_ELEMENT_TEXT: "getText",
+    Command.W3C_EXECUTE_SCRIPT: "executeScript",
+    Command.W3C_EXECUTE_SCRIPT_ASYNC: "executeScript",
+    Command.GET: "navigation",
+    Command.GO_BACK: "navigation",
+    Command.GO_FORWARD: "navigation",
+    Command.REFRESH: "navigation",
+}
+
+NO_PAGE_OBJECT = "<test>"
+
+# Frames from these files belong to page objects; co_filename is compared so
+# the stack walk never has to read frame locals
+PAGES_FOLDER = os.path.dirname(BasePage.__init__.__code__.co_filename) + os.sep
+# @traced wrappers sit between page-object methods on the stack
+_TRACED_WRAPPER = traced(lambda *args: None).__code__
+
+
+class CommandCounter:
+    """Counts WebDriver round-trips sent through a driver"""
+
+    def __init__(self):
+        """Initialize empty counters"""
+        self.by_type = Counter()
+        self.by_method = {}
+        self._driver = None
+
+    @property
+    def total(self):
+        """int: Total number of commands counted"""
+        return sum(self.by_type.values())
+
+    def attach(self, driver):
+        """
+        Start counting commands sent through the driver
+
+        The driver object itself is kept, only its execute() method is
+        shadowed, so page objects and WebElements work unchanged.
+
+        Args:
+            driver: WebDriver instance
+        """
+        execute = driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.record(driver_command, _calling_page_method())
+            return execute(driver_command, params)
+
+        driver.execute = counting_execute
+        self._driver = driver
+
+    def detach(self):
+        """Stop counting and restore the driver's execute() method"""
+        if self._driver is not None:
+            self._driver.__dict__.pop("execute", None)
+            self._driver = None
+
+    def record(self, driver_command, page_method=NO_PAGE_OBJECT):
+        """
+        Count one command
+
+        Args:
+            driver_command: WebDriver command name
+            page_method: Page-object method the command was sent from
+        """
+        command_type = COMMAND_TYPES.get(driver_command, "other")
+        self.by_type[command_type] += 1
+        method_counts = self.by_method.get(page_method)
+        if method_counts is None:
+            method_counts = self.by_method[page_method] = Counter()
+        method_counts[command_type] += 1
+
+    def to_dict(self):
+        """
+        Serialize counters for test reports
+
+        Returns:
+            dict: Total, per-type and per-method counts
+        """
+        return {
+            "total": self.total,
+            "by_type": dict(self.by_type),
+            "by_method": {method: dict(counts) for method, counts in self.by_method.items()},
+        }
+
+
+def _calling_page_method():
+    """
+    Find the outermost page-object method of the current call
+
+    Walks out past the selenium frames to the first page-object method,
+    then through the page-object frames calling it, and stops at the first
+    frame outside pages/ (the test, a fixture or the crawler). Only the
+    locals of the frame that is reported are read.
+
+    Returns:
+        str: "PageClass.method", or NO_PAGE_OBJECT for direct driver calls
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_argcount and code.co_varnames[0] == "self" and code.co_filename.startswith(PAGES_FOLDER):
+            break
+        frame = frame.f_back
+    if frame is None:
+        return NO_PAGE_OBJECT
+
+    outermost = frame
+    frame = frame.f_back
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.startswith(PAGES_FOLDER):
+            if code.co_argcount and code.co_varnames[0] == "self":
+                outermost = frame
+        elif code is not _TRACED_WRAPPER:
+            break
+        frame = frame.f_back
+
+    page = outermost.f_locals.get("self")
+    if not isinstance(page, BasePage):
+        return NO_PAGE_OBJECT
+    return f"{type(page).__name__}.{outermost.f_code.co_name}"
+
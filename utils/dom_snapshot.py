@@ -0,0 +1,202 @@
+"""
+DOM snapshot for answering locator queries without WebDriver round-trips
+"""
+import lxml.html
+from pages.locators import By
+
+VISIBLE_ATTRIBUTE = "data-snapshot-visible"
+VALUE_ATTRIBUTE = "data-snapshot-value"
+BROKEN_IMAGE_ATTRIBUTE = "data-snapshot-broken"
+NON_RENDERED_TAGS = {"script", "style", "template", "noscript"}
+
+# Clones the document and marks every element with its computed visibility,
+# current form value and image load state, so one executeScript call returns
+# everything needed.
+CAPTURE_SCRIPT = """
+var source = document.documentElement;
+var clone = source.cloneNode(true);
+var originals = source.getElementsByTagName('*');
+var copies = clone.getElementsByTagName('*');
+for (var i = 0; i < originals.length; i++) {
+    var element = originals[i];
+    var style = window.getComputedStyle(element);
+    var visible = style.display !== 'none' && style.visibility !== 'hidden' &&
+        parseFloat(style.opacity) > 0 && element.getClientRects().length > 0;
+    copies[i].setAttribute('data-snapshot-visible', visible ? '1' : '0');
+    if ('value' in element && typeof element.value === 'string') {
+        copies[i].setAttribute('data-snapshot-value', element.value);
+    }
+    if (element.tagName === 'IMG') {
+        var broken = element.complete && element.naturalWidth === 0;
+        copies[i].setAttribute('data-snapshot-broken', broken ? '1' : '0');
+    }
+}
+return {url: location.href, title: document.title, html: clone.outerHTML};
+"""
+
+
+class DomSnapshot:
+    """Parsed copy of the page DOM with visibility flags"""
+
+    def __init__(self, html, url="", title=""):
+        """
+        Initialize snapshot
+
+        Args:
+            html: outerHTML of the document element, annotated by CAPTURE_SCRIPT
+            url: URL of the page when captured
+            title: Title of the page when captured
+        """
+        self.url = url
+        self.title = title
+        self.tree = lxml.html.document_fromstring(html)
+        self._cache = {}
+
+    @classmethod
+    def capture(cls, driver):
+        """
+        Capture a snapshot of the current page in one WebDriver call
+
+        Args:
+            driver: WebDriver instance
+
+        Returns:
+            DomSnapshot: Parsed snapshot
+        """
+        result = driver.execute_script(CAPTURE_SCRIPT)
+        return cls(result["html"], url=result["url"], title=result["title"])
+
+    def find_all(self, locator, root=None):
+        """
+        Find all elements matching a locator
+
+        Args:
+            locator: Tuple containing locator strategy and value (e.g., (By.ID, "element_id"))
+            root: Element to search within (default: whole document)
+
+        Returns:
+            list: Matching lxml elements in document order
+        """
+        if root is not None:
+            return self._query(root, locator)
+
+        # Whole-document results are cached per locator
+        elements = self._cache.get(locator)
+        if elements is None:
+            elements = self._cache[locator] = self._query(self.tree, locator)
+        return elements
+
+    def find(self, locator, root=None):
+        """
+        Find the first element matching a locator
+
+        Returns:
+            Element: First match, or None
+        """
+        elements = self.find_all(locator, root)
+        return elements[0] if elements else None
+
+    def count(self, locator):
+        """int: Number of elements matching a locator"""
+        return len(self.find_all(locator))
+
+    def is_element_present(self, locator):
+        """bool: True if an element matching the locator exists"""
+        return bool(self.find_all(locator))
+
+    def is_element_visible(self, locator):
+        """bool: True if the first element matching the locator was visible"""
+        element = self.find(locator)
+        return element is not None and self.is_visible(element)
+
+    def get_text(self, locator, root=None):
+        """
+        Get the visible text of the first element matching a locator
+
+        Returns:
+            str: Text content, or None if no element matches
+        """
+        element = self.find(locator, root)
+        return self.element_text(element) if element is not None else None
+
+    def get_texts(self, locator):
+        """list: Visible text of every element matching a locator"""
+        return [self.element_text(element) for element in self.find_all(locator)]
+
+    def get_attribute(self, locator, name, root=None):
+        """
+        Get an attribute of the first element matching a locator
+
+        Returns:
+            str: Attribute value, or None
+        """
+        element = self.find(locator, root)
+        return element.get(name) if element is not None else None
+
+    def get_value(self, locator):
+        """str: Current value of the first form field matching a locator"""
+        return self.get_attribute(locator, VALUE_ATTRIBUTE)
+
+    @staticmethod
+    def is_visible(element):
+        """bool: True if the element was visible when captured"""
+        return element.get(VISIBLE_ATTRIBUTE) == "1"
+
+    @staticmethod
+    def is_image_broken(element):
+        """bool: True if the image had finished loading without content when captured"""
+        return element.get(BROKEN_IMAGE_ATTRIBUTE) == "1"
+
+    @staticmethod
+    def element_text(element):
+        """
+        Text of an element like WebElement.text: empty when hidden, whitespace collapsed
+
+        Returns:
+            str: Text content
+        """
+        if not DomSnapshot.is_visible(element):
+            return ""
+        parts = []
+        DomSnapshot._collect_text(element, parts)
+        return " ".join("".join(parts).split())
+
+    @staticmethod
+    def _collect_text(element, parts):
+        """Append the rendered text of an element's subtree, leaving out hidden descendants"""
+        if element.text:
+            parts.append(element.text)
+        for child in element:
+            # Comments, hidden elements and script or style content are not rendered,
+            # the text following them is
+            if isinstance(child.tag, str) and child.tag not in NON_RENDERED_TAGS \
+                    and child.get(VISIBLE_ATTRIBUTE) != "0":
+                DomSnapshot._collect_text(child, parts)
+            if child.tail:
+                parts.append(child.tail)
+
+    @staticmethod
+    def _query(root, locator):
+        """Translate a locator into an lxml query"""
+        by, value = locator
+        if by == By.ID:
+            return root.xpath(".//*[@id=$value]", value=value)
+        if by == By.CLASS_NAME:
+            return root.xpath(
+                ".//*[contains(concat(' ', normalize-space(@class), ' '), $value)]",
+                value=f" {value} "
+            )
+        if by == By.NAME:
+            return root.xpath(".//*[@name=$value]", value=value)
+        if by == By.TAG_NAME:
+            return list(root.iterdescendants(value.lower()))
+        if by == By.LINK_TEXT:
+            return [link for link in root.iterdescendants("a") if DomSnapshot.element_text(link) == value]
+        if by == By.PARTIAL_LINK_TEXT:
+            return [link for link in root.iterdescendants("a") if value in DomSnapshot.element_text(link)]
+        if by == By.XPATH:
+            return root.xpath(value)
+        if by == By.CSS_SELECTOR:
+            # Needs the optional cssselect package
+            return root.cssselect(value)
+        raise ValueError(f"Unsupported locator strategy: {by}")
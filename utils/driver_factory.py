@@ -3,7 +3,13 @@ WebDriver Factory for creating browser instances
 """
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from config.settings import BROWSER_NAME, HEADLESS_MODE, IMPLICIT_WAIT
+from utils.execution_profile import ExecutionProfile
+from utils.remote_driver import RemoteNodePool, shared_slots_path
+from utils.webdriver_recording import ReplayConnection
+from utils.performance_log import PerformanceLog
+from config.settings import (
+    REMOTE_MAX_SESSIONS_PER_NODE, REMOTE_CONNECTION_POOL_SIZE, REMOTE_ACQUIRE_TIMEOUT, TRACE_CATEGORIES
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,47 +18,209 @@ logger = logging.getLogger(__name__)
 class DriverFactory:
     """Factory class for creating and managing WebDriver instances"""
     
+    _remote_pool = None
+    _shared_driver = None
+    _shared_driver_tests = 0
+    
     @staticmethod
-    def create_driver(browser_name=BROWSER_NAME):
+    def create_driver(browser_name=None, profile=None):
         """
         Create and return a WebDriver instance
         
         Args:
-            browser_name: Name of the browser to instantiate
+            browser_name: Name of the browser to instantiate (default: profile browser)
+            profile: ExecutionProfile to apply (default: active profile)
             
         Returns:
             WebDriver: Browser driver instance
         """
+        profile = profile or ExecutionProfile.get_active()
+        browser_name = browser_name or profile.browser_name
+        
         if browser_name.lower() == "chrome":
-            return DriverFactory._create_chrome_driver()
+            if profile.remote_endpoints:
+                return DriverFactory._create_remote_chrome_driver(profile)
+            return DriverFactory._create_chrome_driver(profile)
         else:
             raise ValueError(f"Unsupported browser: {browser_name}")
     
     @staticmethod
-    def _create_chrome_driver():
+    def _create_chrome_options(profile):
         """
-        Create and configure Chrome WebDriver
+        Build Chrome options for the given profile
         
+        Args:
+            profile: ExecutionProfile to apply
+            
         Returns:
-            WebDriver: Chrome driver instance
+            Options: Chrome options
         """
         options = Options()
+        options.page_load_strategy = profile.page_load_strategy
         
-        if HEADLESS_MODE:
+        if profile.headless:
             options.add_argument("--headless")
         
+        if profile.window_size:
+            width, height = profile.window_size
+            options.add_argument(f"--window-size={width},{height}")
+        
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--disable-blink-features=AutomationControlled")
+        for argument in profile.chrome_arguments:
+            options.add_argument(argument)
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
         
+        if profile.chrome_trace or profile.network_capture:
+            PerformanceLog.configure_options(
+                options,
+                trace_categories=TRACE_CATEGORIES if profile.chrome_trace else None,
+                network=profile.network_capture
+            )
+        
+        return options
+    
+    @staticmethod
+    def _create_chrome_driver(profile):
+        """
+        Create and configure Chrome WebDriver
+        
+        Args:
+            profile: ExecutionProfile to apply
+            
+        Returns:
+            WebDriver: Chrome driver instance
+        """
+        options = DriverFactory._create_chrome_options(profile)
+        
         driver = webdriver.Chrome(options=options)
-        driver.implicitly_wait(IMPLICIT_WAIT)
+        driver.implicitly_wait(profile.implicit_wait)
+        
+        logger.info(
+            f"Chrome WebDriver initialized with profile '{profile.name}' "
+            f"(pageLoadStrategy: {profile.page_load_strategy}, "
+            f"headless: {profile.headless}, implicit wait: {profile.implicit_wait}s)"
+        )
+        return driver
+    
+    @staticmethod
+    def _create_remote_chrome_driver(profile):
+        """
+        Create Chrome WebDriver on the least loaded remote node
+        
+        Args:
+            profile: ExecutionProfile to apply
+            
+        Returns:
+            WebDriver: Remote driver instance
+        """
+        pool = DriverFactory.get_remote_pool(profile.remote_endpoints)
+        driver = pool.create_driver(DriverFactory._create_chrome_options(profile))
+        driver.implicitly_wait(profile.implicit_wait)
+        
+        logger.info(
+            f"Remote Chrome WebDriver initialized with profile '{profile.name}' "
+            f"(pageLoadStrategy: {profile.page_load_strategy}, implicit wait: {profile.implicit_wait}s)"
+        )
+        return driver
+    
+    @staticmethod
+    def create_replay_driver(recording_path):
+        """
+        Create a driver that replays a recorded session without a browser
+        
+        Args:
+            recording_path: Recording saved by WebDriverRecorder
+            
+        Returns:
+            WebDriver: Remote driver backed by the recording
+        """
+        connection = ReplayConnection.load(recording_path)
+        driver = webdriver.Remote(command_executor=connection, options=Options())
         
-        logger.info(f"Chrome WebDriver initialized with implicit wait: {IMPLICIT_WAIT}s")
+        logger.info(f"Replay WebDriver initialized from: {recording_path}")
         return driver
     
+    @staticmethod
+    def get_remote_pool(endpoints=None):
+        """
+        Get the shared remote node pool, creating it on first use
+        
+        Args:
+            endpoints: Remote endpoint URLs used when creating the pool
+            
+        Returns:
+            RemoteNodePool: Pool, or None if no remote driver was requested yet
+        """
+        if DriverFactory._remote_pool is None and endpoints:
+            DriverFactory._remote_pool = RemoteNodePool(
+                endpoints,
+                max_sessions_per_node=REMOTE_MAX_SESSIONS_PER_NODE,
+                pool_size=REMOTE_CONNECTION_POOL_SIZE,
+                acquire_timeout=REMOTE_ACQUIRE_TIMEOUT,
+                slots_file=shared_slots_path()
+            )
+        return DriverFactory._remote_pool
+    
+    @staticmethod
+    def close_remote_pool():
+        """Close keep-alive connections to the remote nodes"""
+        if DriverFactory._remote_pool is not None:
+            DriverFactory._remote_pool.close()
+            DriverFactory._remote_pool = None
+    
+    @staticmethod
+    def get_shared_driver():
+        """
+        Get the driver reused across tests, creating it if needed
+        
+        Returns:
+            WebDriver: Shared driver instance
+        """
+        if DriverFactory._shared_driver is None:
+            DriverFactory._shared_driver = DriverFactory.create_driver()
+            DriverFactory._shared_driver_tests = 0
+        DriverFactory._shared_driver_tests += 1
+        return DriverFactory._shared_driver
+    
+    @staticmethod
+    def reset_shared_driver():
+        """Clear cookies and storage of the shared driver for the next test"""
+        driver = DriverFactory._shared_driver
+        if driver is None:
+            return
+        
+        driver.delete_all_cookies()
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        driver.get("about:blank")
+        logger.info("Shared WebDriver reset")
+    
+    @staticmethod
+    def recycle_shared_driver(reason):
+        """
+        Quit the shared driver so the next test gets a fresh one
+        
+        Args:
+            reason: Why the driver is recycled, for the log
+        """
+        driver = DriverFactory._shared_driver
+        DriverFactory._shared_driver = None
+        if driver is not None:
+            logger.info(f"Recycling shared WebDriver after {DriverFactory._shared_driver_tests} tests: {reason}")
+            DriverFactory.quit_driver(driver)
+    
+    @staticmethod
+    def shared_driver_test_count():
+        """
+        Number of tests the current shared driver has served
+        
+        Returns:
+            int: Test count
+        """
+        return DriverFactory._shared_driver_tests
+    
     @staticmethod
     def quit_driver(driver):
         """
@@ -62,5 +230,7 @@ class DriverFactory:
             driver: WebDriver instance to close
         """
         if driver:
-            driver.quit()
+            pool = DriverFactory._remote_pool
+            if pool is None or not pool.quit_driver(driver):
+                driver.quit()
             logger.info("WebDriver closed")
@@ -0,0 +1,124 @@
+"""
+Execution profiles for browser and wait configuration
+"""
+import copy
+from config.settings import EXECUTION_PROFILES, DEFAULT_PROFILE, BROWSER_NAME, REMOTE_ENDPOINTS
+import logging
+
+logger = logging.getLogger(__name__)
+
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+
+class ExecutionProfile:
+    """Resolved execution profile shared by DriverFactory and page objects"""
+
+    _active = None
+
+    def __init__(self, name, headless, page_load_strategy, implicit_wait,
+                 explicit_wait, poll_frequency, window_size=None,
+                 chrome_arguments=None, browser_name=BROWSER_NAME,
+                 remote_endpoints=None, reuse_driver=False, chrome_trace=False,
+                 network_capture=False):
+        """
+        Initialize execution profile
+
+        Args:
+            name: Profile name
+            headless: Run browser in headless mode
+            page_load_strategy: WebDriver pageLoadStrategy (normal, eager or none)
+            implicit_wait: Implicit wait timeout in seconds
+            explicit_wait: Explicit wait timeout in seconds
+            poll_frequency: Polling interval of explicit waits in seconds
+            window_size: Tuple of (width, height), or None for the browser default
+            chrome_arguments: Extra Chrome command line flags
+            browser_name: Name of the browser to instantiate
+            remote_endpoints: Remote WebDriver endpoints; empty runs a local browser
+            reuse_driver: Keep one driver across tests, recycled by the memory watchdog
+            chrome_trace: Record browser tracing through the Chrome performance log
+            network_capture: Record Network.* events through the Chrome performance log
+        """
+        if page_load_strategy not in PAGE_LOAD_STRATEGIES:
+            raise ValueError(f"Unsupported page load strategy: {page_load_strategy}")
+
+        self.name = name
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.implicit_wait = implicit_wait
+        self.explicit_wait = explicit_wait
+        self.poll_frequency = poll_frequency
+        self.window_size = tuple(window_size) if window_size else None
+        self.chrome_arguments = list(chrome_arguments or [])
+        self.browser_name = browser_name
+        self.remote_endpoints = list(remote_endpoints or [])
+        self.reuse_driver = reuse_driver
+        self.chrome_trace = chrome_trace
+        self.network_capture = network_capture
+
+    def __repr__(self):
+        return (f"ExecutionProfile(name={self.name!r}, headless={self.headless}, "
+                f"page_load_strategy={self.page_load_strategy!r})")
+
+    def replace(self, **changes):
+        """
+        Copy the profile with some values changed
+
+        Args:
+            **changes: Profile attributes to change
+
+        Returns:
+            ExecutionProfile: New profile
+        """
+        profile = copy.copy(self)
+        for key, value in changes.items():
+            if not hasattr(profile, key):
+                raise AttributeError(f"Unknown profile setting: {key}")
+            setattr(profile, key, value)
+        return profile
+
+    @classmethod
+    def load(cls, name=None, **overrides):
+        """
+        Build a profile from EXECUTION_PROFILES
+
+        Args:
+            name: Profile name (default: DEFAULT_PROFILE)
+            **overrides: Profile values to override; None values are ignored
+
+        Returns:
+            ExecutionProfile: Resolved profile
+        """
+        name = name or DEFAULT_PROFILE
+        if name not in EXECUTION_PROFILES:
+            raise ValueError(
+                f"Unknown execution profile: {name}. "
+                f"Available profiles: {', '.join(sorted(EXECUTION_PROFILES))}"
+            )
+
+        values = dict(EXECUTION_PROFILES[name])
+        values.setdefault("remote_endpoints", REMOTE_ENDPOINTS)
+        values.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(name=name, **values)
+
+    @classmethod
+    def set_active(cls, profile):
+        """
+        Set the profile used by DriverFactory and page objects
+
+        Args:
+            profile: ExecutionProfile instance
+        """
+        cls._active = profile
+        logger.info(f"Active execution profile: {profile}")
+
+    @classmethod
+    def get_active(cls):
+        """
+        Get the active profile, loading the default one if none was set
+
+        Returns:
+            ExecutionProfile: Active profile
+        """
+        if cls._active is None:
+            cls._active = cls.load()
+        return cls._active
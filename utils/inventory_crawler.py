@@ -0,0 +1,357 @@
+"""
+Concurrent multi-user crawler of the inventory and item detail pages
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pages.login_page import LoginPage
+from pages.inventory_page import InventoryPage
+from pages.item_detail_page import ItemDetailPage
+from config.settings import TEST_USERS, CRAWLER_MAX_WORKERS, CRAWLER_ITEMS_PER_TASK
+import logging
+
+logger = logging.getLogger(__name__)
+
+COMPARED_FIELDS = ("name", "description", "price", "image_src")
+
+
+class CrawlResult:
+    """Inventory dataset of all crawled users, keyed by (user, item_id)"""
+
+    def __init__(self):
+        """Initialize an empty dataset"""
+        self.records = {}
+        self.errors = {}
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def add_listing(self, user, listing):
+        """
+        Add the inventory list view of a user
+
+        Args:
+            user: Key of the user in TEST_USERS
+            listing: Products returned by InventoryPage.get_product_listing()
+        """
+        with self._lock:
+            for product in listing:
+                record = self.records.setdefault((user, product['item_id']), {})
+                record.update(product)
+
+    def add_details(self, user, item_id, details):
+        """
+        Add the detail page of an item
+
+        Args:
+            user: Key of the user in TEST_USERS
+            item_id: Inventory item id
+            details: Details returned by ItemDetailPage.get_item_details()
+        """
+        with self._lock:
+            record = self.records.setdefault((user, item_id), {'item_id': item_id})
+            record['detail'] = details
+
+    def add_error(self, user, error):
+        """
+        Record that a user could not be crawled
+
+        Args:
+            user: Key of the user in TEST_USERS
+            error: Error description
+        """
+        with self._lock:
+            self.errors[user] = error
+
+    @property
+    def users(self):
+        """list: Users with at least one record"""
+        return sorted({user for user, _ in self.records})
+
+    def items(self, user):
+        """
+        Records of one user
+
+        Returns:
+            dict: item_id to record
+        """
+        return {item_id: record for (record_user, item_id), record in sorted(self.records.items())
+                if record_user == user}
+
+    def compare_users(self, baseline_user="standard_user"):
+        """
+        Find where users diverge from the baseline user
+
+        Reports broken images, listing fields that differ from the baseline,
+        detail pages that differ from their own listing, and items missing on
+        either side.
+
+        Args:
+            baseline_user: User whose data is taken as reference
+
+        Returns:
+            list: Divergence dictionaries with user, item_id, field, expected and actual
+        """
+        divergences = []
+        baseline = self.items(baseline_user)
+
+        for user in self.users:
+            items = self.items(user)
+            for item_id, record in items.items():
+                detail = record.get('detail', {})
+                if record.get('image_broken'):
+                    divergences.append(_divergence(user, item_id, "image_broken", False, True))
+                if detail.get('image_broken'):
+                    divergences.append(_divergence(user, item_id, "detail.image_broken", False, True))
+
+                for field in COMPARED_FIELDS:
+                    if field in detail and field in record and detail[field] != record[field]:
+                        divergences.append(_divergence(user, item_id, f"detail.{field}", record[field], detail[field]))
+
+                if user == baseline_user:
+                    continue
+                expected = baseline.get(item_id)
+                if expected is None:
+                    divergences.append(_divergence(user, item_id, "item", None, record.get('name')))
+                    continue
+                for field in COMPARED_FIELDS:
+                    if record.get(field) != expected.get(field):
+                        divergences.append(_divergence(user, item_id, field, expected.get(field), record.get(field)))
+
+            if user != baseline_user:
+                for item_id in baseline.keys() - items.keys():
+                    divergences.append(_divergence(user, item_id, "item", baseline[item_id].get('name'), None))
+
+        return divergences
+
+    def to_dataset(self):
+        """
+        Build a columnar dataset of the listings, one group per user
+
+        Returns:
+            InventoryDataset: Dataset for vectorized checks
+        """
+        from utils.inventory_dataset import InventoryDataset
+
+        dataset = InventoryDataset()
+        for user in self.users:
+            dataset.extend(self.items(user).values(), group=user)
+        return dataset
+
+    def save_json(self, path):
+        """
+        Save the dataset as JSON
+
+        Args:
+            path: Output file path
+
+        Returns:
+            str: Path to the saved file
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        data = {
+            "elapsed_seconds": round(self.elapsed, 2),
+            "errors": self.errors,
+            "users": {user: self.items(user) for user in self.users},
+            "divergences": self.compare_users(),
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=4)
+        return path
+
+
+def _divergence(user, item_id, field, expected, actual):
+    """Build a divergence entry"""
+    return {"user": user, "item_id": item_id, "field": field, "expected": expected, "actual": actual}
+
+
+class InventoryCrawler:
+    """Crawls the inventory of several users with a bounded pool of drivers"""
+
+    def __init__(self, users=None, max_workers=CRAWLER_MAX_WORKERS, items_per_task=CRAWLER_ITEMS_PER_TASK):
+        """
+        Initialize crawler
+
+        Args:
+            users: Keys of TEST_USERS to crawl (default: all users)
+            max_workers: Number of worker threads, each with its own driver
+            items_per_task: Item detail pages visited per task
+        """
+        self.users = list(users or TEST_USERS)
+        self.max_workers = max_workers
+        self.items_per_task = items_per_task
+        self._local = threading.local()
+        self._drivers = []
+        self._drivers_lock = threading.Lock()
+        # Detail chunks waiting for a worker, one queue per user
+        self._chunks = {}
+        self._chunks_lock = threading.Lock()
+
+    def crawl(self):
+        """
+        Crawl the list view and every item detail page of all users
+
+        Each user's list view is one task. Its items are then split into
+        detail-page chunks, so the work spreads over all workers regardless of
+        how many users there are. Chunks wait in per-user queues and a worker
+        takes a chunk of the user it is logged in as when there is one, so
+        most chunks run without another login.
+
+        Returns:
+            CrawlResult: Merged dataset
+        """
+        result = CrawlResult()
+        start = time.perf_counter()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crawler") as executor:
+                pending = {executor.submit(self._crawl_listing, user, result): user for user in self.users}
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        user = pending.pop(future)
+                        try:
+                            chunk_count = future.result()
+                        except Exception as e:
+                            logger.error(f"Crawl task of {user} failed: {str(e)}")
+                            result.add_error(user, str(e))
+                            continue
+                        # Each task runs whichever queued chunk suits its worker best
+                        for _ in range(chunk_count):
+                            pending[executor.submit(self._crawl_next_details, result)] = user
+        finally:
+            self._quit_drivers()
+
+        result.elapsed = time.perf_counter() - start
+        logger.info(f"Crawled {len(result.records)} items of {len(self.users)} users "
+                    f"with {self.max_workers} workers in {result.elapsed:.1f}s")
+        return result
+
+    def _crawl_listing(self, user, result):
+        """
+        Extract the inventory list view of a user and queue its detail chunks
+
+        The chunks are queued by the worker itself, so they are waiting before
+        it takes its next task.
+
+        Returns:
+            int: Number of detail chunks queued
+        """
+        driver = self._login(user, result)
+        if driver is None:
+            return 0
+
+        inventory_page = InventoryPage(driver)
+        if not inventory_page.is_inventory_page_loaded():
+            raise RuntimeError(f"Inventory page of {user} did not load")
+        listing = inventory_page.get_product_listing()
+        result.add_listing(user, listing)
+
+        return self._queue_chunks(user, [product['item_id'] for product in listing if product['item_id'] != "N/A"])
+
+    def _queue_chunks(self, user, item_ids):
+        """
+        Split a user's items into detail chunks and queue them
+
+        Returns:
+            int: Number of chunks queued
+        """
+        chunks = [item_ids[i:i + self.items_per_task] for i in range(0, len(item_ids), self.items_per_task)]
+        with self._chunks_lock:
+            self._chunks.setdefault(user, deque()).extend(chunks)
+        return len(chunks)
+
+    def _crawl_next_details(self, result):
+        """
+        Extract the next detail chunk, preferring the user this worker is logged in as
+
+        Errors are recorded for the chunk's user, which is only known here.
+        """
+        user, item_ids = self._take_chunk(getattr(self._local, "user", None))
+        try:
+            self._crawl_details(user, item_ids, result)
+        except Exception as e:
+            logger.error(f"Crawl task of {user} failed: {str(e)}")
+            result.add_error(user, str(e))
+        return 0
+
+    def _take_chunk(self, user):
+        """
+        Take a queued detail chunk
+
+        Args:
+            user: User the worker is logged in as, or None
+
+        Returns:
+            tuple: (user, item ids) of the user's next chunk, or of the user
+                with the most chunks left when the worker's user has none
+        """
+        with self._chunks_lock:
+            if not self._chunks.get(user):
+                user = max(self._chunks, key=lambda key: len(self._chunks[key]))
+            return user, self._chunks[user].popleft()
+
+    def _crawl_details(self, user, item_ids, result):
+        """Extract the detail pages of some items of a user"""
+        driver = self._login(user, result)
+        if driver is None:
+            return []
+
+        detail_page = ItemDetailPage(driver)
+        for item_id in item_ids:
+            detail_page.load(item_id)
+            if not detail_page.is_item_detail_page_loaded():
+                raise RuntimeError(f"Detail page of item {item_id} did not load for {user}")
+            result.add_details(user, item_id, detail_page.get_item_details())
+        return []
+
+    def _login(self, user, result):
+        """
+        Get this worker's driver logged in as the user
+
+        Returns:
+            WebDriver: Logged in driver, None if the user cannot log in
+        """
+        # Imported here so collecting tests does not load selenium
+        from utils.driver_factory import DriverFactory
+
+        driver = getattr(self._local, "driver", None)
+        if driver is None:
+            driver = self._local.driver = DriverFactory.create_driver()
+            self._local.user = None
+            with self._drivers_lock:
+                self._drivers.append(driver)
+
+        if self._local.user == user:
+            return driver
+
+        # Log the previous user out
+        if self._local.user is not None:
+            driver.delete_all_cookies()
+
+        login_page = LoginPage(driver)
+        login_page.load()
+        credentials = TEST_USERS[user]
+        login_page.login_user(credentials['username'], credentials['password'])
+        if not login_page.wait_for_login_result():
+            error = login_page.get_error_message() if login_page.is_error_message_present() else "Login failed"
+            result.add_error(user, error)
+            self._local.user = None
+            return None
+
+        self._local.user = user
+        return driver
+
+    def _quit_drivers(self):
+        """Quit the drivers of all workers"""
+        from utils.driver_factory import DriverFactory
+
+        with self._drivers_lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                DriverFactory.quit_driver(driver)
+            except Exception as e:
+                logger.error(f"Failed to quit crawler driver: {str(e)}")
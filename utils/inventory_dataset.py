@@ -0,0 +1,271 @@
+"""
+Columnar inventory dataset for validating many extracted products at once
+"""
+import math
+from array import array
+from utils.product import Product
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MISSING_ID = -1
+COMPARED_FIELDS = ("name", "description", "price")
+
+
+class InventoryDataset:
+    """
+    Products of several groups (users or snapshots) stored column by column
+
+    Item ids and prices live in typed arrays (-1 and NaN for missing values)
+    and group labels are small integer codes, so thousands of records take a
+    few bytes each. Text columns hold interned strings shared between groups.
+    Checks run on NumPy views of the arrays when NumPy is installed and fall
+    back to plain Python otherwise.
+    """
+
+    def __init__(self):
+        """Initialize an empty dataset"""
+        self.item_ids = array("l")
+        self.prices = array("d")
+        self.group_codes = array("H")
+        self.names = []
+        self.descriptions = []
+        self.groups = []
+        self._group_index = {}
+
+    def __len__(self):
+        return len(self.item_ids)
+
+    @classmethod
+    def from_products(cls, products, group="default"):
+        """
+        Build a dataset from products of one group
+
+        Args:
+            products: Product objects or raw dictionaries from InventoryPage
+            group: Group label, e.g. a user or snapshot name
+
+        Returns:
+            InventoryDataset: New dataset
+        """
+        dataset = cls()
+        dataset.extend(products, group)
+        return dataset
+
+    def extend(self, products, group="default"):
+        """
+        Add products of a group
+
+        Args:
+            products: Product objects or raw dictionaries from InventoryPage
+            group: Group label, e.g. a user or snapshot name
+        """
+        code = self._group_index.get(group)
+        if code is None:
+            code = self._group_index[group] = len(self.groups)
+            self.groups.append(group)
+
+        for product in products:
+            if not isinstance(product, Product):
+                product = Product.from_dict(product)
+            self.item_ids.append(product.item_id if product.item_id is not None else MISSING_ID)
+            self.prices.append(product.price if product.price is not None else math.nan)
+            self.group_codes.append(code)
+            self.names.append(product.name)
+            self.descriptions.append(product.description)
+
+    def product(self, row):
+        """
+        Rebuild the product of a row
+
+        Args:
+            row: Row index
+
+        Returns:
+            Product: Product record
+        """
+        item_id = self.item_ids[row]
+        price = self.prices[row]
+        return Product(
+            item_id=item_id if item_id != MISSING_ID else None,
+            name=self.names[row],
+            description=self.descriptions[row],
+            price=price if not math.isnan(price) else None
+        )
+
+    def products(self, group=None):
+        """
+        Rebuild the products of a group
+
+        Args:
+            group: Group label (default: all rows)
+
+        Returns:
+            list: Product records in insertion order
+        """
+        return [self.product(row) for row in self.rows(group)]
+
+    def rows(self, group=None):
+        """
+        Row indices of a group
+
+        Args:
+            group: Group label (default: all rows)
+
+        Returns:
+            list: Row indices in insertion order
+        """
+        if group is None:
+            return list(range(len(self)))
+        if group not in self._group_index:
+            raise KeyError(f"Unknown group: {group}")
+        code = self._group_index[group]
+        if np is not None:
+            return np.flatnonzero(self._column(self.group_codes) == code).tolist()
+        return [row for row, row_code in enumerate(self.group_codes) if row_code == code]
+
+    @property
+    def nbytes(self):
+        """int: Bytes used by the typed columns and the pointers of the text columns"""
+        columns = (self.item_ids, self.prices, self.group_codes)
+        return sum(column.itemsize * len(column) for column in columns) + 2 * 8 * len(self)
+
+    def unsorted_rows(self, group, descending=False):
+        """
+        Find where the prices of a group break the expected sort order
+
+        Missing prices are skipped; check them with prices_out_of_range().
+
+        Args:
+            group: Group label
+            descending: Expect high to low instead of low to high
+
+        Returns:
+            list: Row indices whose price is out of order with the previous priced row
+        """
+        if np is not None:
+            rows = np.asarray(self.rows(group), dtype=np.intp)
+            prices = self._column(self.prices)[rows]
+            priced = ~np.isnan(prices)
+            rows, steps = rows[priced], np.diff(prices[priced])
+            return rows[np.flatnonzero(steps > 0 if descending else steps < 0) + 1].tolist()
+
+        rows = [row for row in self.rows(group) if not math.isnan(self.prices[row])]
+        broken = []
+        for previous, row in zip(rows, rows[1:]):
+            step = self.prices[row] - self.prices[previous]
+            if (step > 0 if descending else step < 0):
+                broken.append(row)
+        return broken
+
+    def is_sorted_by_price(self, group, descending=False):
+        """
+        Check the price sort order of a group, e.g. after sorting the inventory
+
+        Args:
+            group: Group label
+            descending: Expect high to low instead of low to high
+
+        Returns:
+            bool: True if prices are in order
+        """
+        return not self.unsorted_rows(group, descending)
+
+    def prices_out_of_range(self, low, high, group=None):
+        """
+        Find products whose price is missing or outside a range
+
+        Args:
+            low: Lowest valid price
+            high: Highest valid price
+            group: Group label (default: all rows)
+
+        Returns:
+            list: Product records with an invalid price
+        """
+        rows = self.rows(group)
+        if np is not None:
+            prices = self._column(self.prices)[rows]
+            # NaN fails both comparisons, so missing prices are reported too
+            invalid = np.flatnonzero(~((prices >= low) & (prices <= high)))
+            return [self.product(rows[index]) for index in invalid.tolist()]
+
+        return [self.product(row) for row in rows if not low <= self.prices[row] <= high]
+
+    def compare(self, group, baseline_group, fields=COMPARED_FIELDS):
+        """
+        Compare a group with a baseline group, aligning products by item id
+
+        Args:
+            group: Group label to check, e.g. a user or a newer snapshot
+            baseline_group: Group label taken as reference
+            fields: Product fields to compare
+
+        Returns:
+            list: Divergence dictionaries with item_id, field, expected and actual;
+                  field "item" marks products missing on one side
+        """
+        rows = self._rows_by_item_id(group)
+        baseline_rows = self._rows_by_item_id(baseline_group)
+        common = sorted(rows.keys() & baseline_rows.keys())
+        divergences = []
+
+        if "price" in fields and common:
+            actual_rows = [rows[item_id] for item_id in common]
+            expected_rows = [baseline_rows[item_id] for item_id in common]
+            for index in self._price_mismatches(actual_rows, expected_rows):
+                divergences.append(self._divergence(common[index], "price",
+                                                    expected_rows[index], actual_rows[index]))
+
+        for field in fields:
+            if field == "price":
+                continue
+            column = self.names if field == "name" else self.descriptions
+            for item_id in common:
+                if column[rows[item_id]] != column[baseline_rows[item_id]]:
+                    divergences.append(self._divergence(item_id, field, baseline_rows[item_id], rows[item_id]))
+
+        for item_id in sorted(baseline_rows.keys() - rows.keys()):
+            divergences.append({"item_id": item_id, "field": "item",
+                                "expected": self.names[baseline_rows[item_id]], "actual": None})
+        for item_id in sorted(rows.keys() - baseline_rows.keys()):
+            divergences.append({"item_id": item_id, "field": "item",
+                                "expected": None, "actual": self.names[rows[item_id]]})
+        return divergences
+
+    def _price_mismatches(self, actual_rows, expected_rows):
+        """Positions where two aligned row lists have different prices; two missing prices match"""
+        if np is not None:
+            prices = self._column(self.prices)
+            actual = prices[actual_rows]
+            expected = prices[expected_rows]
+            same = (actual == expected) | (np.isnan(actual) & np.isnan(expected))
+            return np.flatnonzero(~same).tolist()
+
+        mismatches = []
+        for index, (actual_row, expected_row) in enumerate(zip(actual_rows, expected_rows)):
+            actual = self.prices[actual_row]
+            expected = self.prices[expected_row]
+            if actual != expected and not (math.isnan(actual) and math.isnan(expected)):
+                mismatches.append(index)
+        return mismatches
+
+    def _divergence(self, item_id, field, expected_row, actual_row):
+        """Build a divergence entry showing values in the normalized Product.to_dict() format"""
+        return {
+            "item_id": item_id,
+            "field": field,
+            "expected": self.product(expected_row).to_dict()[field],
+            "actual": self.product(actual_row).to_dict()[field],
+        }
+
+    def _rows_by_item_id(self, group):
+        """Map the item ids of a group to their last row, skipping missing ids"""
+        return {self.item_ids[row]: row for row in self.rows(group) if self.item_ids[row] != MISSING_ID}
+
+    @staticmethod
+    def _column(column):
+        """Zero-copy NumPy view of a typed array"""
+        return np.frombuffer(column, dtype=column.typecode)
@@ -19,6 +19,10 @@ def setup_logger(name):
     logger = logging.getLogger(name)
     logger.setLevel(LOG_LEVEL)
     
+    # Already configured: do not open another log file
+    if logger.handlers:
+        return logger
+    
     # Create logs directory if it doesn't exist
     logs_dir = os.path.join(REPORT_FOLDER, "logs")
     os.makedirs(logs_dir, exist_ok=True)
@@ -37,8 +41,7 @@ def setup_logger(name):
     file_handler.setFormatter(file_formatter)
     
     # Add handlers to logger
-    if not logger.handlers:
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
+    logger.addHandler(file_handler)
     
     return logger
@@ -0,0 +1,221 @@
+"""
+Browser memory accounting and driver recycling thresholds
+"""
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+MB = 1024 * 1024
+
+JS_HEAP_SCRIPT = """
+var memory = window.performance && window.performance.memory;
+return memory ? {used: memory.usedJSHeapSize, total: memory.totalJSHeapSize} : null;
+"""
+
+
+class MemorySample:
+    """Memory used by a browser at one point in time"""
+
+    def __init__(self, pss_bytes=None, process_count=0, js_heap_used=None, js_heap_total=None):
+        """
+        Initialize memory sample
+
+        Args:
+            pss_bytes: Proportional set size of the browser process tree, None if unknown
+            process_count: Number of browser processes measured
+            js_heap_used: Used JS heap of the current page in bytes, None if unknown
+            js_heap_total: Allocated JS heap of the current page in bytes, None if unknown
+        """
+        self.pss_bytes = pss_bytes
+        self.process_count = process_count
+        self.js_heap_used = js_heap_used
+        self.js_heap_total = js_heap_total
+
+    def __repr__(self):
+        return (f"MemorySample(pss_mb={_to_mb(self.pss_bytes)}, processes={self.process_count}, "
+                f"js_heap_used_mb={_to_mb(self.js_heap_used)})")
+
+    def to_dict(self):
+        """
+        Serialize the sample for test reports
+
+        Returns:
+            dict: Values in MB, None where unknown
+        """
+        return {
+            "pss_mb": _to_mb(self.pss_bytes),
+            "processes": self.process_count,
+            "js_heap_used_mb": _to_mb(self.js_heap_used),
+            "js_heap_total_mb": _to_mb(self.js_heap_total),
+        }
+
+
+def _to_mb(value):
+    """Convert bytes to MB rounded to one decimal, keeping None"""
+    return round(value / MB, 1) if value is not None else None
+
+
+def _children_by_parent():
+    """
+    Map every process id to its child process ids using /proc
+
+    Returns:
+        dict: Parent pid to list of child pids
+    """
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, fields follow the last ')'
+        parent = int(stat[stat.rindex(")") + 2:].split()[1])
+        children.setdefault(parent, []).append(int(entry))
+    return children
+
+
+def descendant_pids(root_pid):
+    """
+    Find all descendants of a process
+
+    Args:
+        root_pid: Process id
+
+    Returns:
+        list: Descendant process ids
+    """
+    children = _children_by_parent()
+    pids = []
+    pending = list(children.get(root_pid, []))
+    while pending:
+        pid = pending.pop()
+        pids.append(pid)
+        pending.extend(children.get(pid, []))
+    return pids
+
+
+def process_pss(pid):
+    """
+    Proportional set size of a process
+
+    Pages shared between processes (browser binary, shared memory) are split
+    among them, so PSS of a process tree adds up without counting them once per
+    process as RSS does. Falls back to RSS where smaps_rollup is unavailable
+    (Linux before 4.14).
+
+    Args:
+        pid: Process id
+
+    Returns:
+        int: PSS in bytes, 0 if the process is gone
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, IndexError, ValueError):
+        pass
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def browser_root_pid(driver):
+    """
+    Process id of the local driver service (chromedriver)
+
+    Returns:
+        int: Process id, or None for remote and replayed drivers
+    """
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    return getattr(process, "pid", None)
+
+
+def js_heap_usage(driver):
+    """
+    Read the JS heap of the current page
+
+    Uses performance.memory and falls back to the CDP Runtime domain.
+
+    Args:
+        driver: WebDriver instance
+
+    Returns:
+        tuple: (used, total) in bytes, (None, None) if unavailable
+    """
+    try:
+        memory = driver.execute_script(JS_HEAP_SCRIPT)
+        if memory:
+            return memory["used"], memory["total"]
+        if hasattr(driver, "execute_cdp_cmd"):
+            usage = driver.execute_cdp_cmd("Runtime.getHeapUsage", {})
+            return usage["usedSize"], usage["totalSize"]
+    except Exception as e:
+        logger.debug(f"JS heap usage unavailable: {str(e)}")
+    return None, None
+
+
+class MemoryWatchdog:
+    """Samples browser memory and decides when a driver must be recycled"""
+
+    def __init__(self, pss_limit_mb, js_heap_limit_mb):
+        """
+        Initialize memory watchdog
+
+        Args:
+            pss_limit_mb: Browser process tree PSS that triggers recycling, None to disable
+            js_heap_limit_mb: Used JS heap that triggers recycling, None to disable
+        """
+        self.pss_limit_mb = pss_limit_mb
+        self.js_heap_limit_mb = js_heap_limit_mb
+
+    def sample(self, driver):
+        """
+        Measure the memory used by the driver's browser
+
+        PSS covers every process started by the local driver service (browser,
+        renderers, GPU and utility processes) and is only known on Linux.
+
+        Args:
+            driver: WebDriver instance
+
+        Returns:
+            MemorySample: Memory sample
+        """
+        pss_bytes = None
+        process_count = 0
+        root_pid = browser_root_pid(driver)
+        if root_pid is not None and os.path.isdir("/proc"):
+            pids = descendant_pids(root_pid)
+            pss_bytes = sum(process_pss(pid) for pid in pids)
+            process_count = len(pids)
+
+        js_heap_used, js_heap_total = js_heap_usage(driver)
+        return MemorySample(pss_bytes, process_count, js_heap_used, js_heap_total)
+
+    def recycle_reason(self, sample):
+        """
+        Check a sample against the thresholds
+
+        Args:
+            sample: MemorySample
+
+        Returns:
+            str: Reason to recycle the driver, or None if within limits
+        """
+        if self.pss_limit_mb is not None and sample.pss_bytes is not None \
+                and sample.pss_bytes > self.pss_limit_mb * MB:
+            return f"browser PSS {_to_mb(sample.pss_bytes)} MB > {self.pss_limit_mb} MB"
+        if self.js_heap_limit_mb is not None and sample.js_heap_used is not None \
+                and sample.js_heap_used > self.js_heap_limit_mb * MB:
+            return f"JS heap {_to_mb(sample.js_heap_used)} MB > {self.js_heap_limit_mb} MB"
+        return None
@@ -0,0 +1,407 @@
+"""
+Network capture from the Chrome performance log with HAR export and budgets
+"""
+import os
+import re
+import json
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, parse_qsl
+from utils.performance_log import PerformanceLog
+from config.settings import NETWORK_BUDGETS, NETWORK_IDLE_TIMEOUT, NETWORK_QUIET_PERIOD
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE = "page"
+HAR_CREATOR = {"name": "sauce_demo_automation", "version": "1.0"}
+
+
+class NetworkRequest:
+    """One request and its response, built from Network.* DevTools events"""
+
+    __slots__ = ("request_id", "page", "user", "url", "method", "resource_type", "request_headers",
+                 "wall_time", "start", "end", "status", "status_text", "mime_type", "protocol",
+                 "response_headers", "timing", "encoded_bytes", "decoded_bytes", "from_cache", "error")
+
+    def __init__(self, request_id, page, user, params):
+        """
+        Initialize request from a Network.requestWillBeSent event
+
+        Args:
+            request_id: DevTools request id
+            page: Page the request belongs to
+            user: User logged in when the request was sent, or None
+            params: Event parameters
+        """
+        request = params["request"]
+        self.request_id = request_id
+        self.page = page
+        self.user = user
+        self.url = request["url"]
+        self.method = request.get("method", "GET")
+        self.resource_type = params.get("type", "Other")
+        self.request_headers = request.get("headers", {})
+        self.wall_time = params.get("wallTime")
+        self.start = params["timestamp"]
+        self.end = None
+        self.status = 0
+        self.status_text = ""
+        self.mime_type = ""
+        self.protocol = ""
+        self.response_headers = {}
+        self.timing = None
+        self.encoded_bytes = 0
+        self.decoded_bytes = 0
+        self.from_cache = False
+        self.error = None
+
+    def set_response(self, response):
+        """
+        Store a Network.responseReceived response or a redirect response
+
+        Args:
+            response: DevTools Response object
+        """
+        self.status = response.get("status", 0)
+        self.status_text = response.get("statusText", "")
+        self.mime_type = response.get("mimeType", "")
+        self.protocol = response.get("protocol", "")
+        self.response_headers = response.get("headers", {})
+        self.timing = response.get("timing")
+        self.encoded_bytes = response.get("encodedDataLength", 0) or self.encoded_bytes
+        self.from_cache = self.from_cache or response.get("fromDiskCache", False)
+
+    @property
+    def finished(self):
+        """bool: True once the request finished or failed"""
+        return self.end is not None
+
+    @property
+    def duration_ms(self):
+        """float: Time from sending the request to the last byte, None while in flight"""
+        if self.end is None:
+            return None
+        return round((self.end - self.start) * 1000, 1)
+
+    def to_har_entry(self):
+        """
+        Build the HAR entry of the request
+
+        Returns:
+            dict: HAR 1.2 entry
+        """
+        timings = self._har_timings()
+        query = urlsplit(self.url).query
+        return {
+            "pageref": self.page,
+            "startedDateTime": _iso_time(self.wall_time),
+            "time": sum(value for name, value in timings.items() if name != "ssl" and value > 0),
+            "request": {
+                "method": self.method,
+                "url": self.url,
+                "httpVersion": self.protocol or "unknown",
+                "cookies": [],
+                "headers": _har_headers(self.request_headers),
+                "queryString": [{"name": name, "value": value} for name, value in parse_qsl(query)],
+                "headersSize": -1,
+                "bodySize": -1,
+            },
+            "response": {
+                "status": self.status,
+                "statusText": self.status_text,
+                "httpVersion": self.protocol or "unknown",
+                "cookies": [],
+                "headers": _har_headers(self.response_headers),
+                "content": {"size": self.decoded_bytes, "mimeType": self.mime_type},
+                "redirectURL": self.response_headers.get("location", self.response_headers.get("Location", "")),
+                "headersSize": -1,
+                "bodySize": -1,
+                "_transferSize": self.encoded_bytes,
+                "_error": self.error,
+            },
+            "cache": {},
+            "timings": timings,
+            "_resourceType": self.resource_type,
+            "_fromCache": self.from_cache,
+        }
+
+    def _har_timings(self):
+        """
+        Split the request time into HAR phases using the DevTools ResourceTiming
+
+        Returns:
+            dict: HAR timings in milliseconds, -1 where not applicable
+        """
+        total = self.duration_ms or 0
+        timing = self.timing
+        if not timing:
+            return {"blocked": -1, "dns": -1, "connect": -1, "ssl": -1, "send": 0, "wait": total, "receive": 0}
+
+        # Timing offsets are in ms relative to timing["requestTime"]
+        def phase(start, end):
+            return round(timing[end] - timing[start], 1) if timing.get(start, -1) >= 0 else -1
+
+        first = next((timing[key] for key in ("dnsStart", "connectStart", "sendStart") if timing.get(key, -1) >= 0), 0)
+        offset = (timing["requestTime"] - self.start) * 1000
+        headers_end = timing.get("receiveHeadersEnd", timing["sendEnd"])
+        return {
+            "blocked": round(max(offset + first, 0), 1),
+            "dns": phase("dnsStart", "dnsEnd"),
+            "connect": phase("connectStart", "connectEnd"),
+            "ssl": phase("sslStart", "sslEnd"),
+            "send": round(timing["sendEnd"] - timing["sendStart"], 1),
+            "wait": round(headers_end - timing["sendEnd"], 1),
+            "receive": round(max(total - offset - headers_end, 0), 1),
+        }
+
+
+def har_path(folder, nodeid):
+    """
+    Build the HAR file path of a test
+
+    Args:
+        folder: HAR folder
+        nodeid: Pytest node id
+
+    Returns:
+        str: Path of the .har file
+    """
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid.replace("::", "__"))
+    return os.path.join(folder, f"{name}.har")
+
+
+def _iso_time(wall_time):
+    """Format an epoch time in seconds as an ISO 8601 timestamp"""
+    moment = datetime.fromtimestamp(wall_time, timezone.utc) if wall_time else datetime.now(timezone.utc)
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _har_headers(headers):
+    """Convert a DevTools headers object to HAR name/value pairs"""
+    return [{"name": name, "value": str(value)} for name, value in headers.items()]
+
+
+class NetworkCapture:
+    """Requests of one driver, grouped into pages marked by the test"""
+
+    def __init__(self, driver):
+        """
+        Initialize network capture
+
+        The driver must be created with a profile that has network_capture
+        enabled, so chromedriver logs Network.* events.
+
+        Args:
+            driver: WebDriver instance
+        """
+        self.driver = driver
+        self.requests = []
+        self.pages = {}
+        self._in_flight = {}
+        self._position = len(PerformanceLog.messages(driver))
+        self._page = DEFAULT_PAGE
+        self._user = None
+
+    def start_page(self, page, user=None):
+        """
+        Attribute the following requests to a page
+
+        Requests already sent stay with the previous page, even if they
+        finish later.
+
+        Args:
+            page: Page name, e.g. a key of NETWORK_BUDGETS
+            user: Key of the user in TEST_USERS (default: keep the current user)
+        """
+        self.collect()
+        self._page = page
+        if user is not None:
+            self._user = user
+        self.pages.setdefault(page, _iso_time(time.time()))
+
+    def collect(self):
+        """
+        Read new Network.* events from the performance log
+
+        Returns:
+            list: All captured requests
+        """
+        messages = PerformanceLog.messages(self.driver)
+        for message in messages[self._position:]:
+            self._handle(message.get("method", ""), message.get("params", {}))
+        self._position = len(messages)
+        return self.requests
+
+    def wait_for_idle(self, timeout=NETWORK_IDLE_TIMEOUT, quiet_period=NETWORK_QUIET_PERIOD):
+        """
+        Wait until no request is in flight and none started for a quiet period
+
+        Args:
+            timeout: Maximum wait in seconds
+            quiet_period: Seconds without network activity that count as idle
+
+        Returns:
+            bool: True if the network went idle, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        quiet_since = time.monotonic()
+        seen = len(self.collect())
+        while time.monotonic() < deadline:
+            if seen != len(self.requests) or self._in_flight:
+                quiet_since = time.monotonic()
+                seen = len(self.requests)
+            elif time.monotonic() - quiet_since >= quiet_period:
+                return True
+            time.sleep(0.1)
+            self.collect()
+        logger.warning(f"Network not idle after {timeout}s: {len(self._in_flight)} requests in flight")
+        return False
+
+    def _handle(self, method, params):
+        """Update requests from one DevTools event"""
+        if not method.startswith("Network."):
+            return
+        request_id = params.get("requestId")
+
+        if method == "Network.requestWillBeSent":
+            if params["request"]["url"].startswith("data:"):
+                return
+            previous = self._in_flight.pop(request_id, None)
+            if previous is not None and "redirectResponse" in params:
+                previous.set_response(params["redirectResponse"])
+                previous.end = params["timestamp"]
+            request = NetworkRequest(request_id, self._page, self._user, params)
+            self.requests.append(request)
+            self._in_flight[request_id] = request
+            return
+
+        request = self._in_flight.get(request_id)
+        if request is None:
+            return
+        if method == "Network.responseReceived":
+            request.set_response(params["response"])
+        elif method == "Network.requestServedFromCache":
+            request.from_cache = True
+        elif method == "Network.dataReceived":
+            request.decoded_bytes += params.get("dataLength", 0)
+        elif method == "Network.loadingFinished":
+            request.encoded_bytes = params.get("encodedDataLength", request.encoded_bytes)
+            request.end = params["timestamp"]
+            del self._in_flight[request_id]
+        elif method == "Network.loadingFailed":
+            request.error = params.get("errorText") or "failed"
+            request.end = params["timestamp"]
+            del self._in_flight[request_id]
+
+    def requests_for(self, page):
+        """
+        Requests attributed to a page
+
+        Args:
+            page: Page name
+
+        Returns:
+            list: NetworkRequest objects
+        """
+        return [request for request in self.collect() if request.page == page]
+
+    def page_summary(self, page):
+        """
+        Aggregate the requests of a page
+
+        Args:
+            page: Page name
+
+        Returns:
+            dict: requests, bytes, slowest_ms, slowest_url, failed and in_flight
+        """
+        requests = self.requests_for(page)
+        finished = [request for request in requests if request.finished]
+        slowest = max(finished, key=lambda request: request.duration_ms, default=None)
+        return {
+            "requests": len(requests),
+            "bytes": sum(request.encoded_bytes for request in requests),
+            "slowest_ms": slowest.duration_ms if slowest else None,
+            "slowest_url": slowest.url if slowest else None,
+            "failed": sum(1 for request in requests if request.error),
+            "in_flight": len(requests) - len(finished),
+        }
+
+    def summary(self):
+        """
+        Aggregate every page, for test reports
+
+        Returns:
+            list: Page summaries with user and page keys added
+        """
+        self.collect()
+        pages = []
+        for page in dict.fromkeys(request.page for request in self.requests):
+            users = {request.user for request in self.requests if request.page == page}
+            pages.append({"page": page, "user": users.pop() if len(users) == 1 else None,
+                          **self.page_summary(page)})
+        return pages
+
+    def check_budget(self, page, budget=None):
+        """
+        Compare the requests of a page with its budget
+
+        Args:
+            page: Page name
+            budget: Dictionary with max_requests, max_bytes and max_request_ms
+                    (default: NETWORK_BUDGETS[page])
+
+        Returns:
+            list: Budget violations, empty if the page is within budget
+        """
+        budget = budget if budget is not None else NETWORK_BUDGETS[page]
+        summary = self.page_summary(page)
+        violations = []
+        if "max_requests" in budget and summary["requests"] > budget["max_requests"]:
+            violations.append(f"{page}: {summary['requests']} requests > {budget['max_requests']}")
+        if "max_bytes" in budget and summary["bytes"] > budget["max_bytes"]:
+            violations.append(f"{page}: {summary['bytes']} bytes > {budget['max_bytes']}")
+        if "max_request_ms" in budget and summary["slowest_ms"] is not None \
+                and summary["slowest_ms"] > budget["max_request_ms"]:
+            violations.append(f"{page}: {summary['slowest_url']} took {summary['slowest_ms']} ms "
+                              f"> {budget['max_request_ms']} ms")
+        return violations
+
+    def to_har(self):
+        """
+        Build the HAR document of all captured requests
+
+        Returns:
+            dict: HAR 1.2 document
+        """
+        self.collect()
+        pages = dict.fromkeys(request.page for request in self.requests)
+        return {
+            "log": {
+                "version": "1.2",
+                "creator": HAR_CREATOR,
+                "pages": [
+                    {"id": page, "title": page, "startedDateTime": self.pages.get(page, _iso_time(None)),
+                     "pageTimings": {}}
+                    for page in pages
+                ],
+                "entries": [request.to_har_entry() for request in self.requests],
+            }
+        }
+
+    def save_har(self, path):
+        """
+        Write the captured requests as a HAR file
+
+        Args:
+            path: Output file path
+
+        Returns:
+            str: Path to the saved file
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_har(), f, indent=2)
+        logger.info(f"Saved HAR with {len(self.requests)} requests to: {path}")
+        return path
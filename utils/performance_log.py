@@ -0,0 +1,89 @@
+"""
+Chrome performance log shared by browser tracing and network capture
+"""
+import json
+import weakref
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Messages read from each driver; get_log() drains the log, so every reader
+# goes through this buffer
+_buffers = weakref.WeakKeyDictionary()
+
+
+class PerformanceLog:
+    """Access to chromedriver's "performance" log"""
+
+    @staticmethod
+    def configure_options(options, trace_categories=None, network=False):
+        """
+        Enable the performance log on Chrome options
+
+        Args:
+            options: Chrome options
+            trace_categories: Comma separated trace categories, None to disable tracing
+            network: Record Network.* DevTools events
+        """
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        prefs = {"enableNetwork": network, "enablePage": False}
+        if trace_categories:
+            prefs["traceCategories"] = trace_categories
+        options.add_experimental_option("perfLoggingPrefs", prefs)
+
+    @staticmethod
+    def messages(driver):
+        """
+        Read the performance log into the driver's buffer
+
+        Args:
+            driver: WebDriver instance
+
+        Returns:
+            list: All DevTools messages ({"method", "params"}) read since the last clear()
+        """
+        try:
+            return PerformanceLog._drain(driver)
+        except Exception as e:
+            logger.debug(f"Performance log unavailable: {str(e)}")
+            return _buffers.setdefault(driver, [])
+
+    @staticmethod
+    def available(driver):
+        """
+        Check that the driver can read the performance log
+
+        messages() returns nothing new on drivers without it (replayed
+        sessions, other browsers), so callers that need the log check first.
+
+        Args:
+            driver: WebDriver instance
+
+        Returns:
+            bool: True if the log could be read
+        """
+        try:
+            PerformanceLog._drain(driver)
+        except Exception as e:
+            logger.debug(f"Performance log unavailable: {str(e)}")
+            return False
+        return True
+
+    @staticmethod
+    def _drain(driver):
+        """Move new log entries into the driver's buffer; raises if the log cannot be read"""
+        buffer = _buffers.setdefault(driver, [])
+        for entry in driver.get_log("performance"):
+            buffer.append(json.loads(entry["message"])["message"])
+        return buffer
+
+    @staticmethod
+    def clear(driver):
+        """
+        Drop buffered messages, e.g. between tests of a reused driver
+
+        Args:
+            driver: WebDriver instance
+        """
+        PerformanceLog.messages(driver)
+        _buffers.pop(driver, None)
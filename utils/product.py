@@ -0,0 +1,121 @@
+"""
+Typed inventory product record
+"""
+import sys
+
+MISSING = "N/A"
+
+
+def parse_price(text):
+    """
+    Parse a displayed price
+
+    Args:
+        text: Price as shown on the page (e.g. "$29.99"), "N/A" or None
+
+    Returns:
+        float: Price, or None if missing or not a price
+    """
+    if not text or text == MISSING:
+        return None
+    try:
+        return float(text.strip().lstrip("$").replace(",", ""))
+    except ValueError:
+        return None
+
+
+def parse_item_id(value):
+    """
+    Parse an inventory item id
+
+    Args:
+        value: Item id as extracted ("4"), "N/A" or None
+
+    Returns:
+        int: Item id, or None if missing
+    """
+    if value is None or value == MISSING:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _text(value):
+    """Intern extracted text, so repeated names share one string; None for missing"""
+    return sys.intern(value) if value and value != MISSING else None
+
+
+class Product:
+    """
+    Inventory product with a parsed price and item id
+
+    Products compare and hash by value, so they can be deduplicated in sets or
+    used as dictionary keys; do not change a product while it is in one.
+    """
+
+    __slots__ = ("item_id", "name", "description", "price")
+
+    def __init__(self, item_id=None, name=None, description=None, price=None):
+        """
+        Initialize product
+
+        Args:
+            item_id: Inventory item id, None if unknown
+            name: Product name, None if missing
+            description: Product description, None if missing
+            price: Price as a number, None if missing
+        """
+        self.item_id = item_id
+        self.name = name
+        self.description = description
+        self.price = price
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a product from an extracted dictionary of raw strings
+
+        Args:
+            data: Dictionary as returned by InventoryPage.get_all_products()
+                  or get_product_listing()
+
+        Returns:
+            Product: Parsed product
+        """
+        return cls(
+            item_id=parse_item_id(data.get('item_id')),
+            name=_text(data.get('name')),
+            description=_text(data.get('description')),
+            price=parse_price(data.get('price'))
+        )
+
+    def to_dict(self):
+        """
+        Convert to the text fields of get_product_listing(), normalized
+
+        Only the parsed values are kept, so the price is re-formatted with two
+        decimals and thousands separators ("$29.9" becomes "$29.90") rather
+        than returned as originally displayed.
+
+        Returns:
+            dict: item_id, name, description and normalized price, "N/A" for missing values
+        """
+        return {
+            'item_id': str(self.item_id) if self.item_id is not None else MISSING,
+            'name': self.name if self.name is not None else MISSING,
+            'description': self.description if self.description is not None else MISSING,
+            'price': f"${self.price:,.2f}" if self.price is not None else MISSING,
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, Product):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, field) for field in self.__slots__))
+
+    def __repr__(self):
+        return f"Product(item_id={self.item_id}, name={self.name!r}, price={self.price})"
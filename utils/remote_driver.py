@@ -0,0 +1,408 @@
+"""
+Remote WebDriver execution on a pool of Selenium nodes
+"""
+import os
+import json
+import tempfile
+import threading
+import time
+import urllib3
+from selenium import webdriver
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from utils.file_lock import FileLock
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the shared slot table while waiting for a slot
+SLOT_POLL_INTERVAL = 0.5
+
+
+def shared_slots_path(run_id=None):
+    """
+    Slot table file shared by the xdist workers of a run
+
+    Args:
+        run_id: xdist test run id (default: PYTEST_XDIST_TESTRUNUID of this worker)
+
+    Returns:
+        str: Path in the temp folder, or None outside xdist
+    """
+    run_id = run_id or os.environ.get("PYTEST_XDIST_TESTRUNUID")
+    return os.path.join(tempfile.gettempdir(), f"remote_slots_{run_id}.json") if run_id else None
+
+
+def remove_shared_slots(run_id):
+    """
+    Delete the slot table of a finished run and its lock file
+
+    Args:
+        run_id: xdist test run id
+    """
+    path = shared_slots_path(run_id)
+    for leftover in (path, path + ".lock"):
+        try:
+            os.remove(leftover)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove {leftover}: {str(e)}")
+
+
+def _process_alive(pid):
+    """bool: False if the process is known to be gone (checked on POSIX only)"""
+    if os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class CommandLatency:
+    """Aggregated round-trip latency of one WebDriver command"""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed):
+        """
+        Record one round-trip
+
+        Args:
+            elapsed: Round-trip time in seconds
+        """
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    @property
+    def mean(self):
+        """float: Mean round-trip time in seconds"""
+        return self.total / self.count if self.count else 0.0
+
+
+class RemoteNode:
+    """A remote endpoint (Selenium Grid, standalone server or chromedriver)"""
+
+    def __init__(self, url, max_sessions, pool_size):
+        """
+        Initialize remote node
+
+        Args:
+            url: Endpoint URL, e.g. http://localhost:9515
+            max_sessions: Maximum concurrent sessions on this node
+            pool_size: Keep-alive connections kept open to this node
+        """
+        self.url = url.rstrip("/")
+        self.max_sessions = max_sessions
+        self.active_sessions = 0
+        self.total_sessions = 0
+        self.latency = {}
+        self.connection_pool = self._create_connection_pool(pool_size)
+        self._lock = threading.Lock()
+
+    def _create_connection_pool(self, pool_size):
+        """
+        Build the node's keep-alive pool the way selenium builds a connection's
+
+        Follows RemoteConnection._get_connection_manager: a proxy from
+        HTTP_PROXY/HTTPS_PROXY (unless NO_PROXY covers the node) gives a
+        ProxyManager, or a SOCKSProxyManager for socks URLs, and a certificate
+        bundle set on RemoteConnection is verified.
+
+        Args:
+            pool_size: Keep-alive connections kept open to this node
+
+        Returns:
+            urllib3.PoolManager: Pool shared by the node's sessions
+        """
+        # A connection without keep-alive only resolves the node's proxy
+        connection = ChromiumRemoteConnection(self.url, vendor_prefix="goog", browser_name="chrome", keep_alive=False)
+        pool_args = {"num_pools": 1, "maxsize": pool_size, "block": False, "timeout": connection.get_timeout()}
+        ca_certs = connection.get_certificate_bundle_path()
+        if ca_certs:
+            pool_args["cert_reqs"] = "CERT_REQUIRED"
+            pool_args["ca_certs"] = ca_certs
+
+        proxy_url = connection._proxy_url
+        if not proxy_url:
+            return urllib3.PoolManager(**pool_args)
+        logger.info(f"Connecting to {self.url} through proxy")
+        if proxy_url.lower().startswith("sock"):
+            from urllib3.contrib.socks import SOCKSProxyManager
+            return SOCKSProxyManager(proxy_url, **pool_args)
+        if connection._identify_http_proxy_auth():
+            proxy_url, proxy_auth = connection._separate_http_proxy_auth()
+            pool_args["proxy_headers"] = urllib3.make_headers(proxy_basic_auth=proxy_auth)
+        return urllib3.ProxyManager(proxy_url, **pool_args)
+
+    def __repr__(self):
+        return f"RemoteNode(url={self.url!r}, active_sessions={self.active_sessions})"
+
+    def record_latency(self, command, elapsed):
+        """
+        Record the round-trip time of a command sent to this node
+
+        Args:
+            command: WebDriver command name
+            elapsed: Round-trip time in seconds
+        """
+        with self._lock:
+            stats = self.latency.get(command)
+            if stats is None:
+                stats = self.latency[command] = CommandLatency()
+            stats.add(elapsed)
+
+
+class PooledRemoteConnection(ChromiumRemoteConnection):
+    """Command channel that reuses the node's keep-alive connection pool"""
+
+    def __init__(self, node):
+        """
+        Initialize connection to a node
+
+        Args:
+            node: RemoteNode to send commands to
+        """
+        self._node = node
+        self._command = None
+        super().__init__(node.url, vendor_prefix="goog", browser_name="chrome", keep_alive=True)
+
+    def _get_connection_manager(self):
+        """Share one pool per node instead of one per session"""
+        return self._node.connection_pool
+
+    def execute(self, command, params):
+        """Send a command, remembering its name for latency accounting"""
+        self._command = command
+        return super().execute(command, params)
+
+    def _request(self, method, url, body=None):
+        """Send an HTTP request and record its round-trip time"""
+        start = time.perf_counter()
+        try:
+            return super()._request(method, url, body=body)
+        finally:
+            self._node.record_latency(self._command or method, time.perf_counter() - start)
+
+    def close(self):
+        """Keep the shared pool open; it is closed by RemoteNodePool.close()"""
+
+
+class RemoteNodePool:
+    """
+    Balances Remote sessions across a list of endpoints by current load
+
+    Without a slots file, load and the per-node session cap only cover the
+    sessions of this process. With one, every process using the same file
+    (e.g. the xdist workers of a run) shares them.
+    """
+
+    def __init__(self, endpoints, max_sessions_per_node, pool_size, acquire_timeout=300, slots_file=None):
+        """
+        Initialize node pool
+
+        Args:
+            endpoints: List of endpoint URLs
+            max_sessions_per_node: Maximum concurrent sessions per node
+            pool_size: Keep-alive connections kept open per node
+            acquire_timeout: Seconds to wait for a free session slot
+            slots_file: JSON file holding the sessions of every process per node, None for this process only
+        """
+        if not endpoints:
+            raise ValueError("At least one remote endpoint is required")
+
+        self.nodes = [RemoteNode(url, max_sessions_per_node, pool_size) for url in endpoints]
+        self.acquire_timeout = acquire_timeout
+        self.slots_file = slots_file
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+
+    def acquire(self, timeout=None):
+        """
+        Reserve a session slot on the least loaded node
+
+        Waits for release() when every node is at capacity.
+
+        Args:
+            timeout: Seconds to wait for a free slot (default: acquire_timeout)
+
+        Returns:
+            RemoteNode: Selected node
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._slot_freed:
+            while True:
+                node = self._reserve()
+                if node is not None:
+                    return node
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError(f"No free remote session slot after {timeout}s: {self.nodes}")
+                # Slots freed by other processes do not notify this Condition
+                self._slot_freed.wait(min(remaining, SLOT_POLL_INTERVAL) if self.slots_file else remaining)
+
+    def release(self, node):
+        """
+        Free a session slot on a node and wake up a waiting acquire()
+
+        Args:
+            node: RemoteNode returned by acquire()
+        """
+        with self._slot_freed:
+            node.active_sessions = max(node.active_sessions - 1, 0)
+            if self.slots_file is not None:
+                with FileLock(self.slots_file + ".lock"):
+                    table = self._read_slots()
+                    owners = table.get(node.url, {})
+                    pid = str(os.getpid())
+                    if owners.get(pid, 0) > 1:
+                        owners[pid] -= 1
+                    else:
+                        owners.pop(pid, None)
+                    self._write_slots(table)
+            self._slot_freed.notify()
+
+    def _reserve(self):
+        """
+        Take a slot on the least loaded node; the caller holds the pool lock
+
+        Returns:
+            RemoteNode: Selected node, or None if every node is at capacity
+        """
+        if self.slots_file is None:
+            node = self._least_loaded({node.url: node.active_sessions for node in self.nodes})
+        else:
+            with FileLock(self.slots_file + ".lock"):
+                table = self._read_slots()
+                node = self._least_loaded({url: sum(owners.values()) for url, owners in table.items()})
+                if node is not None:
+                    owners = table.setdefault(node.url, {})
+                    pid = str(os.getpid())
+                    owners[pid] = owners.get(pid, 0) + 1
+                    self._write_slots(table)
+
+        if node is not None:
+            node.active_sessions += 1
+            node.total_sessions += 1
+        return node
+
+    def _least_loaded(self, sessions):
+        """
+        Pick the node with the lowest fraction of slots in use
+
+        Args:
+            sessions: Node URL to number of active sessions
+
+        Returns:
+            RemoteNode: Node with a free slot, or None
+        """
+        free = [node for node in self.nodes if sessions.get(node.url, 0) < node.max_sessions]
+        if not free:
+            return None
+        return min(free, key=lambda node: (sessions.get(node.url, 0) / node.max_sessions, node.total_sessions))
+
+    def _read_slots(self):
+        """
+        Read the shared slot table, dropping processes that are gone
+
+        Returns:
+            dict: Node URL to {pid: session count}
+        """
+        try:
+            with open(self.slots_file) as f:
+                table = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {
+            url: {pid: count for pid, count in owners.items() if _process_alive(int(pid))}
+            for url, owners in table.items()
+        }
+
+    def _write_slots(self, table):
+        """Replace the shared slot table"""
+        temporary = f"{self.slots_file}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(table, f)
+        os.replace(temporary, self.slots_file)
+
+    def create_driver(self, options):
+        """
+        Start a Remote session on the least loaded node
+
+        Args:
+            options: Browser options
+
+        Returns:
+            WebDriver: Remote driver instance
+        """
+        node = self.acquire()
+        try:
+            driver = webdriver.Remote(command_executor=PooledRemoteConnection(node), options=options)
+        except Exception:
+            self.release(node)
+            raise
+
+        with self._lock:
+            self._sessions[driver.session_id] = node
+        logger.info(f"Remote session {driver.session_id} started on {node.url} ({node.active_sessions}/{node.max_sessions})")
+        return driver
+
+    def quit_driver(self, driver):
+        """
+        Quit a Remote session and free its node slot
+
+        Args:
+            driver: WebDriver created by create_driver()
+
+        Returns:
+            bool: True if the driver belonged to this pool
+        """
+        with self._lock:
+            node = self._sessions.pop(driver.session_id, None)
+        if node is None:
+            return False
+
+        try:
+            driver.quit()
+        finally:
+            self.release(node)
+        logger.info(f"Remote session closed on {node.url}")
+        return True
+
+    def latency_stats(self):
+        """
+        Per-command network latency of every node, for merging across xdist workers
+
+        Returns:
+            dict: Node URL to {"sessions": int, "commands": {command: {"count", "total", "max"}}},
+                  times in seconds
+        """
+        with self._lock:
+            return {
+                node.url: {
+                    "sessions": node.total_sessions,
+                    "commands": {
+                        command: {"count": stats.count, "total": stats.total, "max": stats.max}
+                        for command, stats in node.latency.items()
+                    },
+                }
+                for node in self.nodes
+            }
+
+    def close(self):
+        """Close the keep-alive connections of every node"""
+        for node in self.nodes:
+            node.connection_pool.clear()
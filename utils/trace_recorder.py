@@ -0,0 +1,276 @@
+"""
+Chrome trace-event export merging Python spans with browser tracing
+"""
+import os
+import re
+import json
+import time
+import uuid
+import threading
+import functools
+from contextlib import contextmanager
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Recorder of the running test, None when tracing is off
+_active = None
+
+
+def trace_path(folder, nodeid):
+    """
+    Build the trace file path of a test
+
+    Args:
+        folder: Traces folder
+        nodeid: Pytest node id
+
+    Returns:
+        str: Path of the .json trace
+    """
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid.replace("::", "__"))
+    return os.path.join(folder, f"{name}.json")
+
+
+def traced(method):
+    """
+    Decorator recording a page-object method as a span when tracing is on
+
+    Args:
+        method: Page-object method
+
+    Returns:
+        function: Wrapped method
+    """
+    # No named self argument, so CommandCounter attributes commands to the
+    # wrapped method rather than to this wrapper
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        recorder = _active
+        if recorder is None:
+            return method(*args, **kwargs)
+        with recorder.span(f"{type(args[0]).__name__}.{method.__name__}", "page_object"):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+class TraceRecorder:
+    """Collects spans of one test and writes them as a trace-event JSON file"""
+
+    def __init__(self, name):
+        """
+        Initialize trace recorder
+
+        Args:
+            name: Test name, stored in the trace metadata
+        """
+        self.name = name
+        self.pid = os.getpid()
+        self.events = []
+        self.browser_events = []
+        self._driver = None
+        self._lock = threading.Lock()
+        self._sync_mark = None
+        self._sync_time = None
+
+    @staticmethod
+    def now():
+        """
+        Current time in trace microseconds
+
+        Browser events are shifted onto this clock by collect_browser_events(),
+        using the mark placed by sync_clock().
+
+        Returns:
+            int: Monotonic time in microseconds
+        """
+        return time.monotonic_ns() // 1000
+
+    @staticmethod
+    def get_active():
+        """
+        Get the recorder of the running test
+
+        Returns:
+            TraceRecorder: Active recorder, or None when tracing is off
+        """
+        return _active
+
+    def activate(self):
+        """Make this recorder receive spans"""
+        global _active
+        _active = self
+
+    def deactivate(self):
+        """Stop receiving spans"""
+        global _active
+        if _active is self:
+            _active = None
+
+    @contextmanager
+    def span(self, name, category="python", args=None):
+        """
+        Record a complete ("X") event around a block
+
+        Args:
+            name: Span name
+            category: Trace category
+            args: Extra values shown in the trace viewer
+        """
+        start = TraceRecorder.now()
+        try:
+            yield
+        finally:
+            self.add_event(name, category, start, TraceRecorder.now() - start, args)
+
+    def add_event(self, name, category, start, duration, args=None):
+        """
+        Add a complete event
+
+        Args:
+            name: Event name
+            category: Trace category
+            start: Start time in trace microseconds
+            duration: Duration in microseconds
+            args: Extra values shown in the trace viewer
+        """
+        event = {
+            "name": name, "cat": category, "ph": "X", "ts": start, "dur": duration,
+            "pid": self.pid, "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    def attach(self, driver):
+        """
+        Record every WebDriver command of the driver as a span
+
+        Args:
+            driver: WebDriver instance
+        """
+        execute = driver.execute
+        self._previous_execute = driver.__dict__.get("execute")
+
+        def tracing_execute(driver_command, params=None):
+            start = TraceRecorder.now()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self.add_event(driver_command, "webdriver", start, TraceRecorder.now() - start)
+
+        driver.execute = tracing_execute
+        self._driver = driver
+
+    def detach(self):
+        """Stop recording WebDriver commands"""
+        if self._driver is not None:
+            if self._previous_execute is None:
+                self._driver.__dict__.pop("execute", None)
+            else:
+                self._driver.execute = self._previous_execute
+            self._driver = None
+
+    def sync_clock(self, driver):
+        """
+        Place a performance.mark in the browser to align its trace clock with now()
+
+        The browser and a remote chromedriver do not share the monotonic clock
+        of this process. The mark shows up as a blink.user_timing trace event,
+        whose ts is matched with the midpoint of the execute_script round trip,
+        so the alignment error is at most half the round trip.
+
+        Args:
+            driver: WebDriver instance
+        """
+        mark = f"trace-clock-sync-{uuid.uuid4().hex}"
+        try:
+            before = TraceRecorder.now()
+            driver.execute_script("performance.mark(arguments[0]);", mark)
+            after = TraceRecorder.now()
+        except Exception as e:
+            logger.warning(f"Could not mark the browser trace clock: {str(e)}")
+            return
+        self._sync_mark = mark
+        self._sync_time = (before + after) // 2
+
+    def collect_browser_events(self, driver):
+        """
+        Read the browser trace events gathered by chromedriver
+
+        Must run before the driver quits. Needs a driver created with a
+        profile that has chrome_trace enabled. Events are shifted onto the
+        clock of now() when the sync_clock() mark is found.
+
+        Args:
+            driver: WebDriver instance
+        """
+        from utils.performance_log import PerformanceLog
+
+        events = []
+        for message in PerformanceLog.messages(driver):
+            if message.get("method") == "Tracing.dataCollected":
+                events.extend(message["params"].get("value", []))
+
+        offset = self._clock_offset(events)
+        if offset is None:
+            logger.warning("No clock sync mark in the browser trace, browser events are not aligned")
+        else:
+            for event in events:
+                if "ts" in event and event.get("ph") != "M":
+                    event["ts"] += offset
+        self.browser_events.extend(events)
+        logger.info(f"Collected {len(events)} browser trace events, clock offset {offset} us")
+
+    def _clock_offset(self, events):
+        """
+        Offset from the browser trace clock to now()
+
+        Returns:
+            int: Microseconds to add to browser timestamps, or None without a sync mark
+        """
+        if self._sync_mark is None:
+            return None
+        for event in events:
+            if event.get("name") == self._sync_mark and "blink.user_timing" in event.get("cat", ""):
+                return self._sync_time - int(event["ts"])
+        return None
+
+    def to_dict(self):
+        """
+        Build the trace-event document
+
+        Returns:
+            dict: Trace in Chrome trace-event format
+        """
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": f"pytest: {self.name}"}},
+            {"name": "process_sort_index", "ph": "M", "pid": self.pid, "args": {"sort_index": -1}},
+        ]
+        for tid in sorted({event["tid"] for event in self.events}):
+            name = "main" if tid == threading.main_thread().ident else f"thread {tid}"
+            metadata.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}})
+
+        return {
+            "traceEvents": metadata + self.events + self.browser_events,
+            "displayTimeUnit": "ms",
+            "metadata": {"test": self.name},
+        }
+
+    def save(self, path):
+        """
+        Write the trace as JSON
+
+        Args:
+            path: Output file path
+
+        Returns:
+            str: Path to the saved trace
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+        logger.info(f"Saved trace with {len(self.events)} Python and "
+                    f"{len(self.browser_events)} browser events to: {path}")
+        return path
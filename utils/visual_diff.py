@@ -0,0 +1,401 @@
+"""
+Visual comparison of screenshots against stored baselines
+"""
+import os
+import io
+import json
+import hashlib
+import threading
+import numpy as np
+from PIL import Image
+from config.settings import (
+    VISUAL_BASELINE_FOLDER, VISUAL_DIFF_THRESHOLD, VISUAL_PIXEL_TOLERANCE, VISUAL_REGION_GRID,
+    VISUAL_HASH_FAIL_DISTANCE
+)
+from utils.file_lock import FileLock
+import logging
+
+logger = logging.getLogger(__name__)
+
+HASH_INDEX_FILE = "hashes.json"
+_DCT_SIZE = 32
+_HASH_SIZE = 8
+
+
+def _dct_matrix(size):
+    """Orthonormal DCT-II matrix, so the 2D DCT is two matrix products"""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2.0 / size)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+_DCT = _dct_matrix(_DCT_SIZE)
+
+
+def decode_png(png_bytes):
+    """
+    Decode PNG data into an RGB array
+
+    Args:
+        png_bytes: PNG file content
+
+    Returns:
+        numpy.ndarray: uint8 array of shape (height, width, 3)
+    """
+    with Image.open(io.BytesIO(png_bytes)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def block_mean(array, rows, cols):
+    """
+    Average a 2D array over a rows x cols grid of blocks
+
+    Args:
+        array: 2D array
+        rows: Number of block rows
+        cols: Number of block columns
+
+    Returns:
+        numpy.ndarray: float array of shape (rows, cols)
+    """
+    height, width = array.shape
+    row_edges = np.linspace(0, height, rows + 1).astype(int)
+    col_edges = np.linspace(0, width, cols + 1).astype(int)
+    # Guard against empty blocks on images smaller than the grid
+    row_starts = np.minimum(row_edges[:-1], height - 1)
+    col_starts = np.minimum(col_edges[:-1], width - 1)
+    sums = np.add.reduceat(np.add.reduceat(array.astype(np.float64), row_starts, axis=0), col_starts, axis=1)
+    areas = np.outer(np.maximum(np.diff(row_edges), 1), np.maximum(np.diff(col_edges), 1))
+    return sums / areas
+
+
+def perceptual_hash(image):
+    """
+    Compute a 64-bit DCT perceptual hash
+
+    Args:
+        image: uint8 RGB array
+
+    Returns:
+        int: Hash value
+    """
+    gray = image @ np.array([0.299, 0.587, 0.114])
+    small = block_mean(gray, _DCT_SIZE, _DCT_SIZE)
+    low_frequencies = (_DCT @ small @ _DCT.T)[:_HASH_SIZE, :_HASH_SIZE].ravel()
+    bits = low_frequencies > np.median(low_frequencies[1:])
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hash_distance(first, second):
+    """
+    Hamming distance between two perceptual hashes
+
+    Returns:
+        int: Number of differing bits
+    """
+    return bin(first ^ second).count("1")
+
+
+def pixel_digest(image):
+    """
+    Digest of the decoded pixels, independent of PNG encoding
+
+    Returns:
+        str: Hex digest
+    """
+    return hashlib.sha1(np.ascontiguousarray(image).data).hexdigest()
+
+
+class VisualDiffResult:
+    """Outcome of a visual comparison"""
+
+    def __init__(self, name, score, mask, region_scores, hash_distance, baseline_created=False):
+        """
+        Initialize result
+
+        Args:
+            name: Baseline name
+            score: Fraction of differing pixels (0.0 identical, 1.0 all different)
+            mask: Boolean array, True where pixels differ
+            region_scores: Fraction of differing pixels per grid region
+            hash_distance: Perceptual hash distance to the baseline
+            baseline_created: True if the screenshot became the new baseline
+        """
+        self.name = name
+        self._score = score
+        self._mask = mask
+        self._region_scores = region_scores
+        self.hash_distance = hash_distance
+        self.baseline_created = baseline_created
+        self.decided_by_hash = False
+        self._pixel_diff = None
+
+    @classmethod
+    def from_hash(cls, name, hash_distance, pixel_diff):
+        """
+        Failed result decided by the perceptual hash distance alone
+
+        The baseline is only decoded if the score, mask or region scores are
+        read, e.g. to save the mask of a failure.
+
+        Args:
+            name: Baseline name
+            hash_distance: Perceptual hash distance to the baseline
+            pixel_diff: Callable returning the VisualDiffResult of the pixel diff
+
+        Returns:
+            VisualDiffResult: Failed result
+        """
+        result = cls(name, None, None, None, hash_distance)
+        result.decided_by_hash = True
+        result._pixel_diff = pixel_diff
+        return result
+
+    def __repr__(self):
+        score = "pending" if self._score is None else f"{self._score:.4f}"
+        return f"VisualDiffResult(name={self.name!r}, score={score}, hash_distance={self.hash_distance})"
+
+    def _resolve(self):
+        """Run the deferred pixel diff of a hash-decided result"""
+        if self._pixel_diff is not None:
+            pixels = self._pixel_diff()
+            self._score, self._mask, self._region_scores = pixels.score, pixels.mask, pixels.region_scores
+            self._pixel_diff = None
+
+    @property
+    def score(self):
+        """float: Fraction of differing pixels"""
+        self._resolve()
+        return self._score
+
+    @property
+    def mask(self):
+        """numpy.ndarray: Boolean array, True where pixels differ"""
+        self._resolve()
+        return self._mask
+
+    @property
+    def region_scores(self):
+        """numpy.ndarray: Fraction of differing pixels per grid region"""
+        self._resolve()
+        return self._region_scores
+
+    @property
+    def passed(self):
+        """bool: True if the score is within VISUAL_DIFF_THRESHOLD, always False when decided by hash"""
+        if self.decided_by_hash:
+            return False
+        return self.score <= VISUAL_DIFF_THRESHOLD
+
+    def changed_regions(self):
+        """
+        Grid regions containing differences
+
+        Returns:
+            list: (row, column, score) tuples, worst first
+        """
+        rows, cols = np.nonzero(self.region_scores)
+        regions = [(int(row), int(col), float(self.region_scores[row, col])) for row, col in zip(rows, cols)]
+        return sorted(regions, key=lambda region: -region[2])
+
+    def save_mask(self, path):
+        """
+        Save the diff mask as a black and white PNG
+
+        Args:
+            path: Output file path
+
+        Returns:
+            str: Path to the saved image
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        Image.fromarray(self.mask.astype(np.uint8) * 255).save(path)
+        return path
+
+
+class VisualComparator:
+    """Compares screenshots against baselines with a cached hash index"""
+
+    def __init__(self, baseline_folder=VISUAL_BASELINE_FOLDER):
+        """
+        Initialize comparator
+
+        Args:
+            baseline_folder: Folder holding baseline PNGs and the hash index
+        """
+        self.baseline_folder = baseline_folder
+        self._index_path = os.path.join(baseline_folder, HASH_INDEX_FILE)
+        self._index = None
+        self._lock = threading.Lock()
+
+    def baseline_path(self, name):
+        """Path of the baseline PNG for a name"""
+        return os.path.join(self.baseline_folder, f"{name}.png")
+
+    def compare(self, name, png_bytes, create_missing=True, baseline_name=None, update_baseline=False):
+        """
+        Compare a screenshot with its baseline
+
+        Most comparisons finish on the hashes cached for the baseline without
+        decoding its image: equal pixel digests are a match, and a different
+        size or a perceptual hash distance of VISUAL_HASH_FAIL_DISTANCE or
+        more is a failure. Only screenshots close to the baseline get a pixel
+        diff, since small changes such as a wrong price barely move the
+        perceptual hash.
+
+        Args:
+            name: Baseline name, e.g. "inventory_page_problem_user"
+            png_bytes: Screenshot PNG content
+            create_missing: Store the screenshot as baseline if none exists
+            baseline_name: Compare against another baseline instead of name's own
+            update_baseline: Replace the baseline with the screenshot if they differ
+
+        Returns:
+            VisualDiffResult: Comparison result, or None if the baseline is missing
+                and create_missing is False
+        """
+        baseline_name = baseline_name or name
+        image = decode_png(png_bytes)
+        current_hash = perceptual_hash(image)
+        digest = pixel_digest(image)
+        entry = self._baseline_entry(baseline_name)
+
+        if entry is None:
+            if not create_missing:
+                return None
+            self._store_baseline(baseline_name, png_bytes, image, current_hash, digest)
+            logger.info(f"Created visual baseline: {self.baseline_path(baseline_name)}")
+            return self._identical(name, image, baseline_created=True)
+
+        if entry["digest"] == digest:
+            return self._identical(name, image)
+
+        if update_baseline:
+            self._store_baseline(baseline_name, png_bytes, image, current_hash, digest)
+            logger.info(f"Updated visual baseline: {self.baseline_path(baseline_name)}")
+            return self._identical(name, image, baseline_created=True)
+
+        distance = hash_distance(current_hash, int(entry["phash"], 16))
+        if list(image.shape) != entry["shape"]:
+            logger.info(f"Visual baseline '{name}' size {entry['shape'][:2]} differs from {list(image.shape[:2])}")
+            return self._size_mismatch(name, image, distance)
+
+        def pixel_diff():
+            with open(self.baseline_path(baseline_name), "rb") as f:
+                baseline = decode_png(f.read())
+            return self.diff(name, image, baseline, distance)
+
+        if distance >= VISUAL_HASH_FAIL_DISTANCE:
+            logger.info(f"Visual diff '{name}': hash distance {distance}, failed without pixel diff")
+            return VisualDiffResult.from_hash(name, distance, pixel_diff)
+        return pixel_diff()
+
+    def diff(self, name, image, baseline, distance=0):
+        """
+        Compute the pixel diff of two decoded images
+
+        Args:
+            name: Baseline name
+            image: uint8 RGB array of the screenshot
+            baseline: uint8 RGB array of the baseline
+            distance: Perceptual hash distance already computed
+
+        Returns:
+            VisualDiffResult: Comparison result
+        """
+        rows, cols = VISUAL_REGION_GRID
+        if image.shape != baseline.shape:
+            logger.info(f"Visual baseline '{name}' size {baseline.shape[:2]} differs from {image.shape[:2]}")
+            return self._size_mismatch(name, image, distance)
+
+        difference = np.abs(image.astype(np.int16) - baseline.astype(np.int16)).max(axis=2)
+        mask = difference > VISUAL_PIXEL_TOLERANCE
+        score = float(mask.mean())
+        region_scores = block_mean(mask, rows, cols)
+        logger.info(f"Visual diff '{name}': score {score:.4f}, hash distance {distance}")
+        return VisualDiffResult(name, score, mask, region_scores, distance)
+
+    def _size_mismatch(self, name, image, distance):
+        """Result for a screenshot whose size differs from its baseline"""
+        rows, cols = VISUAL_REGION_GRID
+        mask = np.ones(image.shape[:2], dtype=bool)
+        return VisualDiffResult(name, 1.0, mask, np.ones((rows, cols)), distance)
+
+    def _identical(self, name, image, baseline_created=False):
+        """Result for a screenshot matching its baseline exactly"""
+        rows, cols = VISUAL_REGION_GRID
+        mask = np.zeros(image.shape[:2], dtype=bool)
+        return VisualDiffResult(name, 0.0, mask, np.zeros((rows, cols)), 0, baseline_created)
+
+    def _load_index(self):
+        """Load the hash index from disk once"""
+        if self._index is None:
+            try:
+                with open(self._index_path) as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _baseline_entry(self, name):
+        """
+        Get the cached hashes of a baseline, refreshing stale entries
+
+        Returns:
+            dict: Index entry, or None if there is no baseline
+        """
+        try:
+            with open(self.baseline_path(name), "rb") as f:
+                png_bytes = f.read()
+        except OSError:
+            return None
+        file_digest = hashlib.sha1(png_bytes).hexdigest()
+
+        # Keyed on the file content, not its mtime, so a fresh checkout keeps the index valid
+        def current(entry):
+            return entry is not None and entry.get("file_digest") == file_digest
+
+        with self._lock:
+            entry = self._load_index().get(name)
+            if not current(entry):
+                # Another xdist worker may have indexed it since the index was loaded
+                self._index = None
+                entry = self._load_index().get(name)
+        if current(entry):
+            return entry
+
+        # Baseline replaced outside the comparator: rebuild its entry
+        baseline = decode_png(png_bytes)
+        return self._index_baseline(name, png_bytes, baseline, perceptual_hash(baseline), pixel_digest(baseline))
+
+    def _store_baseline(self, name, png_bytes, image, phash, digest):
+        """Write a new baseline PNG and index it"""
+        os.makedirs(self.baseline_folder, exist_ok=True)
+        with open(self.baseline_path(name), "wb") as f:
+            f.write(png_bytes)
+        self._index_baseline(name, png_bytes, image, phash, digest)
+
+    def _index_baseline(self, name, png_bytes, image, phash, digest):
+        """
+        Add a baseline to the hash index and persist it
+
+        The index on disk is re-read and merged under a file lock, so xdist
+        workers indexing different baselines keep each other's entries.
+        """
+        entry = {
+            "file_digest": hashlib.sha1(png_bytes).hexdigest(),
+            "shape": list(image.shape),
+            "phash": f"{phash:016x}",
+            "digest": digest,
+        }
+        with self._lock, FileLock(self._index_path + ".lock"):
+            self._index = None
+            index = self._load_index()
+            index[name] = entry
+            temporary = f"{self._index_path}.{os.getpid()}.tmp"
+            with open(temporary, "w") as f:
+                json.dump(index, f, indent=4, sort_keys=True)
+            os.replace(temporary, self._index_path)
+        return entry
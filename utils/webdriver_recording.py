@@ -0,0 +1,180 @@
+"""
+Record and replay of WebDriver command traffic
+"""
+import os
+import re
+import copy
+import gzip
+import json
+from collections import deque
+import logging
+
+logger = logging.getLogger(__name__)
+
+RECORDING_VERSION = 1
+NEW_SESSION = "newSession"
+QUIT = "quit"
+
+
+class ReplayMismatchError(AssertionError):
+    """Raised when replayed code sends a command that was never recorded"""
+
+
+def recording_path(folder, nodeid):
+    """
+    Build the recording file path of a test
+
+    Args:
+        folder: Recordings folder
+        nodeid: Pytest node id
+
+    Returns:
+        str: Path of the .jsonl.gz recording
+    """
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid.replace("::", "__"))
+    return os.path.join(folder, f"{name}.jsonl.gz")
+
+
+def _request_key(command, params):
+    """Key identifying a request, independent of the session id"""
+    params = {key: value for key, value in (params or {}).items() if key != "sessionId"}
+    return f"{command} {json.dumps(params, sort_keys=True, separators=(',', ':'))}"
+
+
+class WebDriverRecorder:
+    """Captures the raw command/response stream of a driver"""
+
+    def __init__(self):
+        """Initialize an empty recording"""
+        # Serialized JSON lines; selenium mutates responses after they are returned
+        self.entries = []
+        self.session_id = None
+        self.capabilities = {}
+        self._executor = None
+
+    def attach(self, driver):
+        """
+        Start recording commands sent by the driver
+
+        Responses are captured as returned by the command executor, before
+        selenium turns element references into WebElements, so they can be
+        served again verbatim.
+
+        Args:
+            driver: WebDriver instance
+        """
+        executor = driver.command_executor
+        execute = executor.execute
+        self.session_id = driver.session_id
+        self.capabilities = dict(driver.caps)
+
+        def recording_execute(command, params):
+            # The executor deletes URL parameters from params, keep a copy
+            request_params = dict(params) if isinstance(params, dict) else params
+            response = execute(command, params)
+            self.entries.append(json.dumps({"c": command, "p": request_params, "r": response}, separators=(",", ":")))
+            return response
+
+        executor.execute = recording_execute
+        self._executor = executor
+
+    def detach(self):
+        """Stop recording and restore the command executor"""
+        if self._executor is not None:
+            self._executor.__dict__.pop("execute", None)
+            self._executor = None
+
+    def save(self, path):
+        """
+        Write the recording as gzipped JSON lines
+
+        Args:
+            path: Output file path
+
+        Returns:
+            str: Path to the saved recording
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        header = {"version": RECORDING_VERSION, "session_id": self.session_id, "capabilities": self.capabilities}
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(header, separators=(",", ":")) + "\n")
+            for entry in self.entries:
+                f.write(entry + "\n")
+        logger.info(f"Saved {len(self.entries)} WebDriver commands to: {path}")
+        return path
+
+
+class ReplayConnection:
+    """Command executor serving recorded responses without a browser"""
+
+    def __init__(self, session_id, capabilities, entries):
+        """
+        Initialize replay connection
+
+        Responses are queued per request (command and parameters) in recorded
+        order. Once a queue is drained its last response keeps being served,
+        so wait loops that poll more often than during recording still
+        behave the same.
+
+        Args:
+            session_id: Recorded session id
+            capabilities: Recorded session capabilities
+            entries: Recorded entries
+        """
+        self.session_id = session_id
+        self.capabilities = capabilities
+        self._responses = {}
+        self._last = {}
+        for entry in entries:
+            key = _request_key(entry["c"], entry["p"])
+            self._responses.setdefault(key, deque()).append(entry["r"])
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a recording saved by WebDriverRecorder
+
+        Args:
+            path: Recording file path
+
+        Returns:
+            ReplayConnection: Connection serving the recording
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != RECORDING_VERSION:
+                raise ValueError(f"Unsupported recording version in {path}: {header.get('version')}")
+            entries = [json.loads(line) for line in f]
+        return cls(header["session_id"], header["capabilities"], entries)
+
+    def execute(self, command, params):
+        """
+        Serve the recorded response of a command
+
+        Args:
+            command: WebDriver command name
+            params: Command parameters
+
+        Returns:
+            dict: Recorded response
+        """
+        if command == NEW_SESSION:
+            return {"value": {"sessionId": self.session_id, "capabilities": self.capabilities}}
+
+        key = _request_key(command, params)
+        queue = self._responses.get(key)
+        if queue:
+            response = queue.popleft()
+            self._last[key] = response
+        elif key in self._last:
+            response = self._last[key]
+        elif command == QUIT:
+            return {"value": None}
+        else:
+            raise ReplayMismatchError(f"No recorded response for WebDriver command: {key}")
+
+        # Selenium replaces values in the response, never hand out the original
+        return copy.deepcopy(response)
+
+    def close(self):
+        """Nothing to release"""